@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Small on-disk JSON cache shared by network-backed helpers
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Optional
+
+CACHE_DIR_ENV = "LOL_VIEWER_CACHE_DIR"
+
+
+def get_cache_dir() -> str:
+    """Return the per-user cache directory (created on demand)
+
+    ``LOL_VIEWER_CACHE_DIR`` overrides the default location, which is
+    ``%LOCALAPPDATA%\\lol-viewer`` on Windows and ``~/.cache/lol-viewer``
+    elsewhere.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+            cache_dir = os.path.join(os.environ["LOCALAPPDATA"], "lol-viewer")
+        else:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "lol-viewer")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def cache_path(name: str) -> str:
+    """Return the absolute path of cache entry *name*"""
+    return os.path.join(get_cache_dir(), name)
+
+
+def read_json(name: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """Read cache entry *name*, or None if missing, unreadable or stale
+
+    Args:
+        name: File name inside the cache directory
+        max_age: Maximum age in seconds based on the file mtime (None = no limit)
+    """
+    try:
+        path = cache_path(name)
+        if max_age is not None:
+            if time.time() - os.path.getmtime(path) > max_age:
+                return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(name: str, data: Any) -> bool:
+    """Atomically write *data* to cache entry *name*
+
+    The payload goes to a temporary file in the same directory first and is
+    then moved into place with ``os.replace`` so readers never see a partial
+    file. Returns False (without raising) if the cache is not writable.
+    """
+    try:
+        cache_dir = get_cache_dir()
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, os.path.join(cache_dir, name))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
@@ -6,6 +6,7 @@ Handles loading champion data and providing autocomplete functionality
 import json
 import os
 import sys
+from collections import OrderedDict
 from typing import Dict, List, Optional
 from PyQt6.QtCore import Qt, QSize, QRect, QUrl, QObject, QEvent, QTimer, QStringListModel
 from PyQt6.QtGui import QStandardItemModel, QStandardItem, QPixmap, QImage
@@ -21,6 +22,9 @@ from logger import log
 class ChampionData:
     """Class to manage champion data"""
 
+    # Distinct queries whose results search() keeps (least recently used dropped first)
+    SEARCH_CACHE_SIZE = 256
+
     def __init__(self, data_file: str = "champions.json"):
         """
         Initialize champion data.
@@ -37,10 +41,23 @@ class ChampionData:
             self.data_file = data_file
 
         self.champions: Dict[str, dict] = {}
+        # search() hits (indices into _search_entries) keyed by lowercased
+        # query, in LRU order; reset by load_data()
+        self._search_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Column-wise search index built by load_data(): lowercased haystacks
+        # and ready-made result entries, both ordered by English name
+        self._search_ids: List[str] = []
+        self._search_english: List[str] = []
+        self._search_japanese: List[str] = []
+        self._search_entries: List[dict] = []
+        # Previous scanned query and the indices it matched (incremental search)
+        self._last_query = ""
+        self._last_indices: List[int] = []
         self.load_data()
 
     def load_data(self):
         """Load champion data from JSON file"""
+        self._search_cache = OrderedDict()
         log(f"[ChampionData] Loading data from: {self.data_file}")
         log(f"[ChampionData] File exists: {os.path.exists(self.data_file)}")
 
@@ -51,6 +68,7 @@ class ChampionData:
         try:
             with open(self.data_file, 'r', encoding='utf-8') as f:
                 self.champions = json.load(f)
+            self._build_search_index()
             log(f"[ChampionData] Loaded {len(self.champions)} champions from {self.data_file}")
             # Print first few champions for verification
             if self.champions:
@@ -62,6 +80,29 @@ class ChampionData:
             import traceback
             traceback.print_exc()
             self.champions = {}
+            self._build_search_index()
+
+    def _build_search_index(self):
+        """Precompute the lowercased columns and result entries used by search()"""
+        entries = []
+        for champ_id, data in self.champions.items():
+            english_name = data.get('english_name', '')
+            japanese_name = data.get('japanese_name', '')
+            entries.append({
+                'id': champ_id,
+                'english_name': english_name,
+                'japanese_name': japanese_name,
+                'image_url': data.get('image_url', ''),
+                'display_name': f"{english_name} ({japanese_name})"
+            })
+        # Stable sort, so filtering keeps the order a per-query sort would give
+        entries.sort(key=lambda x: x['english_name'])
+        self._search_entries = entries
+        self._search_ids = [e['id'] for e in entries]
+        self._search_english = [e['english_name'].lower() for e in entries]
+        self._search_japanese = [e['japanese_name'].lower() for e in entries]
+        self._last_query = ""
+        self._last_indices = []
 
     def search(self, query: str) -> List[dict]:
         """
@@ -77,27 +118,39 @@ class ChampionData:
             return []
 
         query_lower = query.lower()
-        matches = []
-
-        for champ_id, data in self.champions.items():
-            english_name = data.get('english_name', '').lower()
-            japanese_name = data.get('japanese_name', '').lower()
-
-            # Check if query matches English name, Japanese name, or champion ID
-            if (query_lower in english_name or
-                query_lower in japanese_name or
-                query_lower in champ_id):
-                matches.append({
-                    'id': champ_id,
-                    'english_name': data.get('english_name', ''),
-                    'japanese_name': data.get('japanese_name', ''),
-                    'image_url': data.get('image_url', ''),
-                    'display_name': f"{data.get('english_name', '')} ({data.get('japanese_name', '')})"
-                })
-
-        # Sort by English name
-        matches.sort(key=lambda x: x['english_name'])
-        return matches
+        indices = self._search_cache.get(query_lower)
+        if indices is not None:
+            self._search_cache.move_to_end(query_lower)
+            return self._result_entries(indices)
+
+        # Typing extends the previous query, and anything matching "ashe" also
+        # matches "ash", so only the previous hits need rechecking
+        if self._last_query and query_lower.startswith(self._last_query):
+            candidates = self._last_indices
+        else:
+            candidates = range(len(self._search_entries))
+
+        # Check if query matches English name, Japanese name, or champion ID;
+        # entries are pre-sorted by English name
+        english, japanese, ids = self._search_english, self._search_japanese, self._search_ids
+        indices = [
+            i for i in candidates
+            if (query_lower in english[i] or
+                query_lower in japanese[i] or
+                query_lower in ids[i])
+        ]
+        self._last_query = query_lower
+        self._last_indices = indices
+
+        self._search_cache[query_lower] = tuple(indices)
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return self._result_entries(indices)
+
+    def _result_entries(self, indices) -> List[dict]:
+        """Fresh copies of the indexed entries, so callers cannot alter the index"""
+        entries = self._search_entries
+        return [dict(entries[i]) for i in indices]
 
     def get_champion(self, name_or_id: str) -> Optional[dict]:
         """
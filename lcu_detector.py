@@ -4,14 +4,31 @@ LCU Champion Detector - Detects current champion from League Client
 """
 import base64
 import logging
-import re
+import threading
 import time
-from typing import Optional, Dict, Callable
-import requests
-import urllib3
-import psutil
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from types import MappingProxyType
+from typing import Optional, Dict, List, Callable, Mapping, TYPE_CHECKING
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal, QCoreApplication
 
+import app_cache
+
+# orjson parses LCU payloads straight from bytes and is much faster than the
+# stdlib; fall back to json when it is not installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+
+def _parse_json(response):
+    """Decode a requests response body (bytes) with the fastest available parser"""
+    return _json_loads(response.content)
+
+
 # Import logger for debug output
 try:
     from logger import log
@@ -20,20 +37,64 @@ except ImportError:
     def log(msg):
         print(msg)
 
-
-# Disable SSL warnings for self-signed certificates
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+if TYPE_CHECKING:
+    import psutil
+    import requests
 
 logger = logging.getLogger(__name__)
 
 
+# psutil (C extension, probes the process table) and requests (urllib3,
+# charset detection, idna, ...) are only imported when first needed.
+def _get_psutil():
+    global psutil
+    import psutil
+    return psutil
+
+
+def _get_requests():
+    global requests
+    if 'requests' not in globals():
+        import urllib3
+        # Disable SSL warnings for self-signed certificates
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    import requests
+    return requests
+
+
+def __getattr__(name):
+    # Module attribute access (e.g. mock.patch('lcu_detector.psutil...'))
+    # triggers the lazy import as well.
+    if name == 'psutil':
+        return _get_psutil()
+    if name == 'requests':
+        return _get_requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# LeagueClientUx command-line flags carrying the LCU credentials
+_CRED_FLAGS = {'--app-port': 'port', '--remoting-auth-token': 'password'}
+
+
 class LCUConnectionManager:
     """Manages connection to the LCU API"""
 
+    __slots__ = ('port', 'password', 'connected', '_client_running_cache',
+                 '_cached_pid', '_cached_cmdline', '_auth_cache', '_session')
+
+    # Seconds an is_client_running() result is reused before rescanning processes
+    _CLIENT_RUNNING_TTL = 1.5
+
     def __init__(self):
         self.port: Optional[str] = None
         self.password: Optional[str] = None
         self.connected = False
+        self._client_running_cache: tuple = (0.0, False)  # (monotonic timestamp, result)
+        # Last seen client process, so polls can check one PID instead of
+        # walking the whole process table
+        self._cached_pid: Optional[int] = None
+        self._cached_cmdline: Optional[list] = None
+        self._auth_cache: Optional[tuple] = None  # (password, "Basic ..." header)
+        self._session = None  # requests.Session, reused so polls skip the TLS handshake
         log("[LCU] LCUConnectionManager initialized")
         logger.info("LCUConnectionManager initialized")
 
@@ -62,35 +123,75 @@ class LCUConnectionManager:
     def _get_lcu_credentials_from_process(self) -> Optional[Dict[str, str]]:
         """Get LCU credentials from LeagueClientUx process"""
         try:
-            for proc in psutil.process_iter(['name', 'cmdline']):
+            # Reuse the command line of the last seen client while it is alive
+            if self._cached_cmdline is not None and self._cached_process_alive():
+                credentials = self._parse_credentials(self._cached_cmdline)
+                if credentials:
+                    return credentials
+
+            for proc in _get_psutil().process_iter(['name', 'cmdline']):
                 if proc.info['name'] in ['LeagueClientUx.exe', 'LeagueClientUx']:
-                    cmdline = ' '.join(proc.info['cmdline'])
-
-                    # Extract --app-port=12345
-                    port_match = re.search(r'--app-port=(\d+)', cmdline)
-                    # Extract --remoting-auth-token=abc123
-                    token_match = re.search(r'--remoting-auth-token=([\w-]+)', cmdline)
-
-                    if port_match and token_match:
-                        logger.debug(f"Found LCU process with port {port_match.group(1)}")
-                        return {
-                            'port': port_match.group(1),
-                            'password': token_match.group(1)
-                        }
+                    credentials = self._parse_credentials(proc.info['cmdline'])
+                    if credentials:
+                        self._cached_pid = proc.pid
+                        self._cached_cmdline = proc.info['cmdline']
+                        logger.debug(f"Found LCU process with port {credentials['port']}")
+                        return credentials
         except Exception as e:
             logger.error(f"Error getting LCU credentials: {e}")
 
         return None
 
-    def is_client_running(self) -> bool:
-        """Check if LoL client is running"""
+    @staticmethod
+    def _parse_credentials(cmdline) -> Optional[Dict[str, str]]:
+        """Extract port/password from a LeagueClientUx command line"""
+        # Split --app-port=12345 / --remoting-auth-token=abc123 per
+        # argument and stop as soon as both have been seen
+        found = {}
+        for arg in cmdline or ():
+            flag, _, value = arg.partition('=')
+            key = _CRED_FLAGS.get(flag)
+            if key and value:
+                found[key] = value
+                if len(found) == 2:
+                    break
+
+        port = found.get('port')
+        if port and port.isdigit() and found.get('password'):
+            return found
+        return None
+
+    def _cached_process_alive(self) -> bool:
+        """Check the remembered client PID; forget it once the process is gone"""
+        if self._cached_pid is None:
+            return False
+        if _get_psutil().pid_exists(self._cached_pid):
+            return True
+        self._cached_pid = None
+        self._cached_cmdline = None
+        return False
+
+    def is_client_running(self, use_cache: bool = True) -> bool:
+        """Check if LoL client is running (cached for _CLIENT_RUNNING_TTL seconds)"""
+        now = time.monotonic()
+        ts, running = self._client_running_cache
+        if use_cache and ts and now - ts < self._CLIENT_RUNNING_TTL:
+            return running
+
+        running = False
         try:
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] in ['LeagueClient.exe', 'LeagueClientUx.exe']:
-                    return True
+            if self._cached_process_alive():
+                running = True
+            else:
+                for proc in _get_psutil().process_iter(['name']):
+                    if proc.info['name'] in ['LeagueClient.exe', 'LeagueClientUx.exe']:
+                        self._cached_pid = proc.pid
+                        running = True
+                        break
         except Exception as e:
             logger.error(f"Error checking if client is running: {e}")
-        return False
+        self._client_running_cache = (now, running)
+        return running
 
     def disconnect(self, reason: str = ""):
         """Reset connection credentials."""
@@ -103,25 +204,52 @@ class LCUConnectionManager:
         self.connected = False
         self.port = None
         self.password = None
+        # Credentials may be stale (e.g. client restarting); rescan next time
+        self._cached_pid = None
+        self._cached_cmdline = None
 
     def get_auth_header(self) -> str:
-        """Get authorization header for LCU API"""
+        """Get authorization header for LCU API (encoded once per password)"""
+        cached = self._auth_cache
+        if cached is not None and cached[0] == self.password:
+            return cached[1]
         credentials = f"riot:{self.password}"
         encoded = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded}"
+        header = f"Basic {encoded}"
+        self._auth_cache = (self.password, header)
+        return header
+
+    def _get_session(self):
+        """Return the keep-alive session used for LCU requests (created on first use)"""
+        if self._session is None:
+            requests = _get_requests()
+            session = requests.Session()
+            # LCU uses a self-signed certificate on 127.0.0.1
+            session.verify = False
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def close(self):
+        """Close the pooled LCU connection(s)"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
     def make_request(self, endpoint: str) -> Optional[dict]:
         """Make a request to LCU API"""
         if not self.connected or not self.port or not self.password:
             return None
 
+        requests = _get_requests()
         try:
             url = f"https://127.0.0.1:{self.port}{endpoint}"
             headers = {'Authorization': self.get_auth_header()}
-            response = requests.get(url, headers=headers, verify=False, timeout=2)
+            response = self._get_session().get(url, headers=headers, timeout=2)
 
             if response.status_code == 200:
-                return response.json()
+                return _parse_json(response)
             else:
                 logger.debug(f"LCU API returned status {response.status_code} for {endpoint}")
                 return None
@@ -138,12 +266,25 @@ class LCUConnectionManager:
 class GamePhaseTracker:
     """Tracks the current game phase"""
 
+    __slots__ = ('lcu_manager', 'current_phase', 'last_session_data',
+                 '_phase_poll_counter', '_phase_poll_stride',
+                 '_phase_cache_ts', '_phase_ttl')
+
     def __init__(self, lcu_manager: LCUConnectionManager):
         self.lcu_manager = lcu_manager
         self.current_phase = "None"
         # Cache the last gameflow session payload so other components can
         # read queue/gameMode without issuing extra requests.
         self.last_session_data: Optional[dict] = None
+        # InProgress is long-lived and stable, so only every Nth call
+        # actually queries the gameflow session while in game (the service
+        # also polls more slowly then, ~20s between session reads).
+        self._phase_poll_counter = 0
+        self._phase_poll_stride = 4
+        # Phase transitions are user-driven (seconds-scale), so a successful
+        # read is reused for a short window when callers poll back-to-back.
+        self._phase_cache_ts = 0.0
+        self._phase_ttl = 0.2
         logger.info("GamePhaseTracker initialized")
 
     # Phases where a transient API failure should NOT reset to "None".
@@ -151,14 +292,23 @@ class GamePhaseTracker:
 
     def update_phase(self) -> str:
         """Update and return current game phase"""
+        now = time.monotonic()
+        if now - self._phase_cache_ts < self._phase_ttl:
+            return self.current_phase
+        if self.current_phase == "InProgress":
+            self._phase_poll_counter += 1
+            if self._phase_poll_counter % self._phase_poll_stride != 0:
+                return self.current_phase
         try:
             data = self.lcu_manager.make_request("/lol-gameflow/v1/session")
             if data:
+                self._phase_cache_ts = now
                 self.last_session_data = data
                 new_phase = data.get('phase', 'None')
                 if new_phase != self.current_phase:
                     logger.info(f"Game phase changed: {self.current_phase} -> {new_phase}")
                     self.current_phase = new_phase
+                    self._phase_poll_counter = 0
                 return self.current_phase
             else:
                 # If we can't get the session and we are in an active game phase,
@@ -227,7 +377,16 @@ class GamePhaseTracker:
 class ChampionDetector:
     """Detects current champion from LCU API"""
 
-    def __init__(self, lcu_manager: LCUConnectionManager, phase_tracker: GamePhaseTracker):
+    __slots__ = ('lcu_manager', 'phase_tracker', '_champion_tables',
+                 'current_champion_id', 'current_champion_name', 'current_lane',
+                 'current_summoner_id', 'detected_enemy_champions',
+                 '_cached_matchup_pairs', '_matchup_pairs_locked',
+                 '_last_champ_select_timer', '_cached_allies', '_cached_enemies',
+                 '_summoner_id_fetch_failures', '_phase_handlers',
+                 '_session_index_cache', '_map_ready')
+
+    def __init__(self, lcu_manager: LCUConnectionManager, phase_tracker: GamePhaseTracker,
+                 champion_map: Optional[Dict[int, str]] = None):
         self.lcu_manager = lcu_manager
         self.phase_tracker = phase_tracker
         self.current_champion_id: Optional[int] = None
@@ -241,38 +400,164 @@ class ChampionDetector:
         self._cached_allies: list = []  # Cache allies for InProgress merge
         self._cached_enemies: list = []  # Cache enemies for InProgress merge
         self._summoner_id_fetch_failures: int = 0  # Retry limit for summoner ID fetch
-        self.champion_map: Dict[int, str] = {}
+        # (session payload, {summonerId: team}) for the last gameData seen
+        self._session_index_cache: Optional[tuple] = None
+        self.champion_map = {}
+        # detect_champion_and_enemies dispatch; unknown phases keep current state
+        self._phase_handlers: Dict[str, Callable[[str], tuple]] = {
+            'ChampSelect': self._handle_champ_select,
+            'InProgress': self._handle_in_progress,
+            'None': self._handle_game_ended,
+            'Lobby': self._handle_game_ended,
+        }
         logger.info("ChampionDetector initialized")
-        self._load_champion_map()
+        # Set once champion_map holds its final value (loaded or failed)
+        self._map_ready = threading.Event()
+        if champion_map is not None:
+            # Pre-built mapping supplied by the caller: skip the Data Dragon fetch
+            self.champion_map = dict(champion_map)
+            self._map_ready.set()
+        else:
+            # Fetch in the background so app start-up does not wait on Data Dragon
+            threading.Thread(target=self._load_and_signal, name="champion-map",
+                             daemon=True).start()
+
+    @property
+    def champion_map(self) -> Mapping[int, str]:
+        """Read-only championId -> name mapping (0 maps to "" = not picked)"""
+        return self._champion_tables[0]
+
+    @property
+    def champion_names(self) -> List[str]:
+        """Dense championId -> name list built from the same mapping as champion_map"""
+        return self._champion_tables[1]
+
+    @champion_map.setter
+    def champion_map(self, mapping: Dict[int, str]):
+        # Champion IDs are small non-negative ints, so lookups on the hot
+        # paths index the dense champion_names list instead of hashing.
+        mapping = {int(k): v for k, v in mapping.items()}
+        mapping[0] = ""
+        names = [""] * (max(mapping) + 1)
+        for cid, name in mapping.items():
+            if cid >= 0:
+                names[cid] = name
+        # One assignment, so the loader thread never publishes a map without its names
+        self._champion_tables = (MappingProxyType(mapping), names)
+
+    def _champion_name(self, cid) -> str:
+        """championId -> name, "" for unpicked (0/None) or unknown IDs"""
+        names = self.champion_names
+        if cid and 0 < cid < len(names):
+            return names[cid]
+        return ""
+
+    # Data Dragon only changes on patch boundaries, so the resolved version is
+    # reused for a while and the champion map is persisted per version.
+    _VERSION_CACHE_FILE = "ddragon-version.json"
+    _VERSION_CACHE_TTL = 6 * 60 * 60  # seconds
+    # Phases whose handlers resolve champion names, and how long a poll may
+    # wait for a cold-start map load before skipping the tick
+    _NAMED_PHASES = frozenset(("ChampSelect", "InProgress"))
+    _MAP_WAIT_TIMEOUT = 0.05  # seconds
+
+    def _load_and_signal(self):
+        """Background-thread entry point for the cold-start champion map load"""
+        try:
+            self._load_champion_map()
+        finally:
+            self._map_ready.set()
+
+    def wait_for_champion_map(self, timeout: Optional[float] = None) -> bool:
+        """Block until the champion map is loaded; returns False on timeout"""
+        return self._map_ready.wait(timeout)
 
     def _load_champion_map(self):
         """Load champion ID to name mapping from Data Dragon"""
         try:
-            # Get latest version
-            version_url = "https://ddragon.leagueoflegends.com/api/versions.json"
-            versions = requests.get(version_url, timeout=10).json()
-            latest_version = versions[0]
-            logger.info(f"Using Data Dragon version: {latest_version}")
-
-            # Get champion data
-            champion_url = f"https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json"
-            data = requests.get(champion_url, timeout=10).json()
-
-            # Create ID to name mapping
-            self.champion_map = {int(v['key']): k for k, v in data['data'].items()}
-            # Normalize champion names: Riot API uses "MonkeyKing" internally,
-            # but the app (champions.json, lolalytics, etc.) expects "Wukong"
-            CHAMPION_NAME_ALIASES = {"MonkeyKing": "Wukong"}
-            self.champion_map = {
-                k: CHAMPION_NAME_ALIASES.get(v, v)
-                for k, v in self.champion_map.items()
-            }
+            cached = app_cache.read_json(self._VERSION_CACHE_FILE, max_age=self._VERSION_CACHE_TTL)
+            if isinstance(cached, dict) and cached.get("version"):
+                latest_version = cached["version"]
+                logger.info(f"Using Data Dragon version: {latest_version}")
+                self.champion_map = self._load_champion_map_cached(latest_version)
+            else:
+                # Version check is due. Meanwhile load the map for the last known
+                # version in the background; it is used if the version is unchanged.
+                stale = app_cache.read_json(self._VERSION_CACHE_FILE)
+                if not isinstance(stale, dict):
+                    stale = {}
+                last_version = stale.get("version")
+                pool = ThreadPoolExecutor(max_workers=1) if last_version else None
+                prefetch = pool.submit(self._load_champion_map_cached, last_version) if pool else None
+                try:
+                    # Get latest version (conditional request: 304 when unchanged)
+                    version_url = "https://ddragon.leagueoflegends.com/api/versions.json"
+                    headers = {}
+                    if last_version and stale.get("etag"):
+                        headers['If-None-Match'] = stale["etag"]
+                    if last_version and stale.get("last_modified"):
+                        headers['If-Modified-Since'] = stale["last_modified"]
+                    try:
+                        response = _get_requests().get(version_url, headers=headers, timeout=10)
+                        if response.status_code == 304 and last_version:
+                            latest_version = last_version
+                            meta = stale
+                        else:
+                            latest_version = _parse_json(response)[0]
+                            meta = {
+                                "version": latest_version,
+                                "etag": response.headers.get('ETag'),
+                                "last_modified": response.headers.get('Last-Modified'),
+                            }
+                    except Exception as e:
+                        if prefetch is None:
+                            raise
+                        # Offline or Data Dragon hiccup: the last known version's
+                        # map is still good; the check is retried on the next start
+                        logger.warning(f"Data Dragon version check failed, using {last_version}: {e}")
+                        latest_version, meta = last_version, None
+                    if meta is not None:
+                        # Rewriting also refreshes the mtime used for the TTL
+                        app_cache.write_json(self._VERSION_CACHE_FILE, meta)
+                    logger.info(f"Using Data Dragon version: {latest_version}")
+
+                    if prefetch is not None and latest_version == last_version:
+                        self.champion_map = prefetch.result()
+                    else:
+                        self.champion_map = self._load_champion_map_cached(latest_version)
+                finally:
+                    if pool is not None:
+                        pool.shutdown(wait=False)
             logger.info(f"Loaded {len(self.champion_map)} champions from Data Dragon")
 
         except Exception as e:
             logger.error(f"Error loading champion map: {e}")
             self.champion_map = {}
 
+    def _load_champion_map_cached(self, version: str) -> Dict[int, str]:
+        """Return the ID to name mapping for *version*, fetching it only on a cache miss"""
+        cache_name = f"champions-{version}.json"
+        cached = app_cache.read_json(cache_name)
+        if isinstance(cached, dict) and cached:
+            # JSON object keys are always strings
+            return {int(k): v for k, v in cached.items()}
+
+        # Get champion data
+        champion_url = f"https://ddragon.leagueoflegends.com/cdn/{version}/data/en_US/champion.json"
+        data = _parse_json(_get_requests().get(champion_url, timeout=10))
+
+        # Create ID to name mapping
+        champion_map = {int(v['key']): k for k, v in data['data'].items()}
+        # Normalize champion names: Riot API uses "MonkeyKing" internally,
+        # but the app (champions.json, lolalytics, etc.) expects "Wukong"
+        CHAMPION_NAME_ALIASES = {"MonkeyKing": "Wukong"}
+        champion_map = {
+            k: CHAMPION_NAME_ALIASES.get(v, v)
+            for k, v in champion_map.items()
+        }
+        app_cache.write_json(cache_name, champion_map)
+        return champion_map
+
     def detect_champion_and_enemies(self) -> tuple:
         """Detect own champion and enemy champions in a single API call
 
@@ -289,94 +574,101 @@ class ChampionDetector:
         """
         try:
             phase = self.phase_tracker.update_phase()
-
-            if phase == 'ChampSelect':
-                # Detect new ChampSelect session by checking timer field of session data
-                data = self.lcu_manager.make_request("/lol-champ-select/v1/session")
-                if not data:
-                    return (None, [], None)
-
-                is_new_session = False
-                session_timer = data.get('timer', {}).get('internalNowInEpochMs', 0)
-                # Detect new session: timer resets or session data has new localPlayerCellId
-                # We use a simple heuristic: if timer jumped backward or session has different counter
-                if self._last_champ_select_timer == 0 or session_timer < self._last_champ_select_timer:
-                    is_new_session = True
-                    logger.info("New ChampSelect session detected – signaling UI clear")
-                    self._matchup_pairs_locked = False
-                    self._cached_matchup_pairs = []
-                    self._cached_allies = []
-                    self._cached_enemies = []
-                self._last_champ_select_timer = session_timer
-
-                # Detect own champion
-                own_champion_result = self._detect_own_champion_from_data(data)
-
-                # Update own champion state
-                if own_champion_result:
-                    champion_id, lane = own_champion_result
-                    if champion_id and champion_id > 0:
-                        self.current_champion_id = champion_id
-                        self.current_champion_name = self.champion_map.get(champion_id)
-                        self.current_lane = lane
-                        if self.current_champion_name:
-                            logger.info(f"Detected champion in champ select: {self.current_champion_name} (lane: {lane})")
-
-                # Detect enemy champions
-                enemy_champions = self._detect_enemy_champions_from_data(data)
-
-                # Extract allies with lane info and enemies in pick order
-                allies = self.get_allies_from_data(data)
-                enemies = self.get_enemies_from_data(data)
-
-                matchup_info = {
-                    "allies": allies,
-                    "enemies": enemies,
-                    "phase": "ChampSelect",
-                    "is_new_session": is_new_session,
-                }
-
-                own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
-                return (own_result, enemy_champions, matchup_info)
-
-            elif phase == 'InProgress':
-                # In game - return cached champion, and try to get full matchup data
-                # from gameData (covers ARAM / blind pick where enemies weren't visible in ChampSelect)
-                own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
-                allies = self.get_allies_from_gamedata()
-                enemies = self.get_enemies_from_gamedata()
-
-                matchup_info = {
-                    "allies": allies,
-                    "enemies": enemies,
-                    "phase": "InProgress",
-                    "is_new_session": False,
-                }
-                return (own_result, [], matchup_info)
-
-            elif phase == 'None' or phase == 'Lobby':
-                # Not in game - reset champion state but DO NOT emit matchup data
-                # so the previous match's list remains visible until next ChampSelect.
-                if self.current_champion_name:
-                    logger.info("Game ended, resetting champion state")
-                self.current_champion_id = None
-                self.current_champion_name = None
-                self.current_lane = None
-                self.current_summoner_id = None
-                self.detected_enemy_champions.clear()
-                self._last_champ_select_timer = 0
-                # Return None for matchup_info – UI should NOT be updated
+            if phase in self._NAMED_PHASES and not self.wait_for_champion_map(self._MAP_WAIT_TIMEOUT):
+                # Names would all resolve to "" (and could lock); retry next tick
                 return (None, [], None)
-
-            else:
-                # Other phases - keep current state, no matchup update
-                own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
-                return (own_result, [], None)
-
+            return self._phase_handlers.get(phase, self._handle_other_phase)(phase)
         except Exception as e:
             logger.error(f"Error detecting champions: {e}")
             return (None, [], None)
 
+    def _handle_champ_select(self, phase: str) -> tuple:
+        """detect_champion_and_enemies handler for ChampSelect"""
+        # Detect new ChampSelect session by checking timer field of session data
+        data = self.lcu_manager.make_request("/lol-champ-select/v1/session")
+        if not data:
+            return (None, [], None)
+
+        is_new_session = False
+        session_timer = data.get('timer', {}).get('internalNowInEpochMs', 0)
+        # Detect new session: timer resets or session data has new localPlayerCellId
+        # We use a simple heuristic: if timer jumped backward or session has different counter
+        if self._last_champ_select_timer == 0 or session_timer < self._last_champ_select_timer:
+            is_new_session = True
+            logger.info("New ChampSelect session detected – signaling UI clear")
+            self._matchup_pairs_locked = False
+            self._cached_matchup_pairs = []
+            self._cached_allies = []
+            self._cached_enemies = []
+        self._last_champ_select_timer = session_timer
+
+        # Detect own champion
+        own_champion_result = self._detect_own_champion_from_data(data)
+
+        # Update own champion state
+        if own_champion_result:
+            champion_id, lane = own_champion_result
+            if champion_id and champion_id > 0:
+                self.current_champion_id = champion_id
+                self.current_champion_name = self.champion_map.get(champion_id)
+                self.current_lane = lane
+                if self.current_champion_name:
+                    logger.info(f"Detected champion in champ select: {self.current_champion_name} (lane: {lane})")
+
+        # Detect enemy champions
+        enemy_champions = self._detect_enemy_champions_from_data(data)
+
+        # Extract allies with lane info and enemies in pick order
+        allies = self.get_allies_from_data(data)
+        enemies = self.get_enemies_from_data(data)
+
+        matchup_info = {
+            "allies": allies,
+            "enemies": enemies,
+            "phase": "ChampSelect",
+            "is_new_session": is_new_session,
+        }
+
+        own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
+        return (own_result, enemy_champions, matchup_info)
+
+    def _handle_in_progress(self, phase: str) -> tuple:
+        """detect_champion_and_enemies handler for InProgress"""
+        # In game - return cached champion, and try to get full matchup data
+        # from gameData (covers ARAM / blind pick where enemies weren't visible in ChampSelect)
+        own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
+        allies = self.get_allies_from_gamedata()
+        enemies = self.get_enemies_from_gamedata()
+
+        matchup_info = {
+            "allies": allies,
+            "enemies": enemies,
+            "phase": "InProgress",
+            "is_new_session": False,
+        }
+        return (own_result, [], matchup_info)
+
+    def _handle_game_ended(self, phase: str) -> tuple:
+        """detect_champion_and_enemies handler for None/Lobby"""
+        # Not in game - reset champion state but DO NOT emit matchup data
+        # so the previous match's list remains visible until next ChampSelect.
+        if self.current_champion_name:
+            logger.info("Game ended, resetting champion state")
+        self.current_champion_id = None
+        self.current_champion_name = None
+        self.current_lane = None
+        self.current_summoner_id = None
+        self.detected_enemy_champions.clear()
+        self._last_champ_select_timer = 0
+        # Return None for matchup_info – UI should NOT be updated
+        return (None, [], None)
+
+    def _handle_other_phase(self, phase: str) -> tuple:
+        """detect_champion_and_enemies handler for every other phase"""
+        # Other phases - keep current state, no matchup update
+        own_result = (self.current_champion_name, self.current_lane) if self.current_champion_name else None
+        return (own_result, [], None)
+
     def detect_champion(self) -> Optional[str]:
         """Detect own champion only (backwards-compatible helper).
 
@@ -387,6 +679,8 @@ class ChampionDetector:
             phase = self.phase_tracker.update_phase()
 
             if phase == 'ChampSelect':
+                if not self.wait_for_champion_map(self._MAP_WAIT_TIMEOUT):
+                    return None
                 data = self.lcu_manager.make_request("/lol-champ-select/v1/session")
                 if not data:
                     return None
@@ -505,14 +799,12 @@ class ChampionDetector:
         try:
             allies = []
             for player in data.get('myTeam', []):
-                cid = player.get('championId', 0)
-                if cid > 0:
-                    name = self.champion_map.get(cid, "")
-                    if name:
-                        lane = player.get('assignedPosition', '').lower()
-                        if lane == 'utility':
-                            lane = 'support'
-                        allies.append((name, lane))
+                name = self._champion_name(player.get('championId'))
+                if name:
+                    lane = player.get('assignedPosition', '').lower()
+                    if lane == 'utility':
+                        lane = 'support'
+                    allies.append((name, lane))
             return allies
         except Exception as e:
             logger.error(f"Error extracting allies from data: {e}")
@@ -528,11 +820,9 @@ class ChampionDetector:
         try:
             enemies = []
             for player in data.get('theirTeam', []):
-                cid = player.get('championId', 0)
-                if cid > 0:
-                    name = self.champion_map.get(cid, "")
-                    if name:
-                        enemies.append(name)
+                name = self._champion_name(player.get('championId'))
+                if name:
+                    enemies.append(name)
             return enemies
         except Exception as e:
             logger.error(f"Error extracting enemies from data: {e}")
@@ -551,11 +841,9 @@ class ChampionDetector:
 
             allies = []
             for player in my_team:
-                cid = player.get('championId', 0)
-                if cid and cid > 0:
-                    name = self.champion_map.get(cid, "")
-                    if name:
-                        allies.append((name, ""))
+                name = self._champion_name(player.get('championId'))
+                if name:
+                    allies.append((name, ""))
 
             # Merge with cache: keep cached names that are not in new data
             if allies or not self._cached_allies:
@@ -578,11 +866,9 @@ class ChampionDetector:
 
             enemies = []
             for player in their_team:
-                cid = player.get('championId', 0)
-                if cid and cid > 0:
-                    name = self.champion_map.get(cid, "")
-                    if name:
-                        enemies.append(name)
+                name = self._champion_name(player.get('championId'))
+                if name:
+                    enemies.append(name)
 
             if enemies or not self._cached_enemies:
                 self._cached_enemies = enemies
@@ -612,12 +898,21 @@ class ChampionDetector:
 
         my_team, their_team = team_one, team_two
         if self.current_summoner_id:
-            team_one_ids = {p.get('summonerId') for p in team_one}
-            if self.current_summoner_id not in team_one_ids:
+            if self._summoner_team_index(session, team_one, team_two).get(self.current_summoner_id) != 'teamOne':
                 my_team, their_team = team_two, team_one
 
         return (my_team, their_team)
 
+    def _summoner_team_index(self, session: dict, team_one: list, team_two: list) -> dict:
+        """Return {summonerId: 'teamOne'|'teamTwo'}, rebuilt only for a new session payload."""
+        cached = self._session_index_cache
+        if cached is not None and cached[0] is session:
+            return cached[1]
+        index = {p.get('summonerId'): 'teamTwo' for p in team_two}
+        index.update({p.get('summonerId'): 'teamOne' for p in team_one})
+        self._session_index_cache = (session, index)
+        return index
+
     def get_matchup_pairs_from_data(self, data: dict) -> list:
         """Extract positional matchup pairs (ally, enemy) from champ select data.
 
@@ -629,19 +924,11 @@ class ChampionDetector:
             my_team = data.get('myTeam', [])
             their_team = data.get('theirTeam', [])
 
-            pairs = []
-            for i in range(max(len(my_team), len(their_team))):
-                ally = ""
-                enemy = ""
-                if i < len(my_team):
-                    cid = my_team[i].get('championId', 0)
-                    if cid > 0:
-                        ally = self.champion_map.get(cid, "")
-                if i < len(their_team):
-                    cid = their_team[i].get('championId', 0)
-                    if cid > 0:
-                        enemy = self.champion_map.get(cid, "")
-                pairs.append((ally, enemy))
+            name_of = self._champion_name
+            pairs = [
+                (name_of(a.get('championId')), name_of(b.get('championId')))
+                for a, b in zip_longest(my_team, their_team, fillvalue={})
+            ]
 
             return pairs[:5]
         except Exception as e:
@@ -653,50 +940,34 @@ class ChampionDetector:
 
         Uses cached summonerId to determine which team is ally/enemy.
         Merges with previously cached pairs to handle incomplete data (e.g., late-loading champions).
-        Once all 10 champions are confirmed, the list is locked and returned as-is until the game ends.
+        Once all 10 champions are confirmed, the pairs are locked (frozen as a tuple)
+        and returned as-is until the game ends.
 
         Returns:
-            list of (ally_champion_name, enemy_champion_name) tuples (up to 5).
+            list (tuple once locked) of (ally_champion_name, enemy_champion_name) tuples (up to 5).
         """
         try:
-            # Once all 10 champions are confirmed, return cached data without re-reading API
-            if self._matchup_pairs_locked and self._cached_matchup_pairs:
-                return list(self._cached_matchup_pairs)
-
-            session = self.phase_tracker.last_session_data
-            if not session:
+            # Once all 10 champions are confirmed, return cached data without
+            # touching the session at all
+            if self._matchup_pairs_locked:
                 return self._cached_matchup_pairs
-            game_data = session.get('gameData') or {}
-            team_one = game_data.get('teamOne') or []
-            team_two = game_data.get('teamTwo') or []
 
-            if not team_one and not team_two:
+            # Determine which team is ours using summonerId (fetched if not
+            # cached yet, e.g. app started mid-game)
+            my_team, their_team = self._get_teams_from_gamedata()
+            if my_team is None:
                 return self._cached_matchup_pairs
 
-            # Fetch summoner ID if not cached (e.g., app started mid-game)
-            if not self.current_summoner_id:
-                self._fetch_current_summoner_id()
-
-            # Determine which team is ours using summonerId
-            my_team, their_team = team_one, team_two
-            if self.current_summoner_id:
-                team_one_ids = {p.get('summonerId') for p in team_one}
-                if self.current_summoner_id not in team_one_ids:
-                    my_team, their_team = team_two, team_one
-
-            pairs = []
-            for i in range(max(len(my_team), len(their_team))):
-                ally = ""
-                enemy = ""
-                if i < len(my_team):
-                    cid = my_team[i].get('championId', 0)
-                    if cid and cid > 0:
-                        ally = self.champion_map.get(cid, "")
-                if i < len(their_team):
-                    cid = their_team[i].get('championId', 0)
-                    if cid and cid > 0:
-                        enemy = self.champion_map.get(cid, "")
-                pairs.append((ally, enemy))
+            # Parallel championId columns; unpicked/missing slots (0, None,
+            # padding) and unknown/negative IDs resolve to ""
+            ally_ids = [p.get('championId') or 0 for p in my_team]
+            enemy_ids = [p.get('championId') or 0 for p in their_team]
+            names = self.champion_names
+            n = len(names)
+            pairs = [
+                (names[a] if 0 <= a < n else "", names[b] if 0 <= b < n else "")
+                for a, b in zip_longest(ally_ids, enemy_ids, fillvalue=0)
+            ]
 
             # Merge with cached pairs: keep existing values if new value is empty
             merged = []
@@ -712,6 +983,9 @@ class ChampionDetector:
                 if not self._matchup_pairs_locked:
                     logger.info("All 10 champions confirmed – locking matchup pairs until game ends")
                     self._matchup_pairs_locked = True
+                    # Immutable from here on: freeze so callers cannot mutate it
+                    self._cached_matchup_pairs = tuple(merged)
+                    return self._cached_matchup_pairs
 
             return merged
         except Exception as e:
@@ -770,6 +1044,8 @@ class ChampionDetectorService(QObject):
         self.check_count = 0  # Track number of checks for logging
         self.base_interval_ms = 2000
         self.max_interval_ms = 60000
+        # Slower rate once nothing can change any more (in game / matchup locked)
+        self.in_game_interval_ms = 5000
         self.current_interval_ms = self.base_interval_ms
         self.is_checking = False
         self._polling_paused = False
@@ -834,6 +1110,7 @@ class ChampionDetectorService(QObject):
         logger.info("Stopping champion detection service")
         self.running = False
         self.timer.stop()
+        self.lcu_manager.close()
 
     def manual_connect_attempt(self):
         """Immediately try to connect to the client on user request."""
@@ -880,6 +1157,20 @@ class ChampionDetectorService(QObject):
             logger.info("Polling interval reset to base")
             self._set_timer_interval(self.base_interval_ms)
 
+    def _phase_interval_ms(self) -> int:
+        """Polling interval for the current phase (never faster than the base interval)."""
+        if self.phase_tracker.current_phase == "InProgress" or self.detector._matchup_pairs_locked:
+            return max(self.base_interval_ms, self.in_game_interval_ms)
+        return self.base_interval_ms
+
+    def _apply_phase_interval(self):
+        """Switch the timer to the phase's polling rate if it differs."""
+        if self._polling_paused:
+            return
+        interval_ms = self._phase_interval_ms()
+        if interval_ms != self.current_interval_ms:
+            self._set_timer_interval(interval_ms)
+
     def resume_polling(self):
         """Resume polling after it was paused (e.g., all 10 champions detected)."""
         if self._polling_paused:
@@ -905,7 +1196,7 @@ class ChampionDetectorService(QObject):
 
             logger.debug(f"Check #{self.check_count}: connected={self.lcu_manager.connected}")
 
-            is_running = self.lcu_manager.is_client_running()
+            is_running = self.lcu_manager.is_client_running(use_cache=not force)
             logger.debug(f"Client running: {is_running}, connected={self.lcu_manager.connected}")
 
             if not is_running:
@@ -918,8 +1209,8 @@ class ChampionDetectorService(QObject):
                 self._clear_champion_state()
                 return
 
-            # LoL client is running - ensure we're polling quickly
-            self._reset_backoff()
+            # LoL client is running - leave backoff, poll at the phase's rate
+            self._apply_phase_interval()
 
             # Try to connect if not connected
             if not self.lcu_manager.connected:
@@ -945,6 +1236,9 @@ class ChampionDetectorService(QObject):
                 self._set_connection_status("connecting")
                 return
 
+            # Phase may have changed during detection
+            self._apply_phase_interval()
+
             # Only emit matchup data when there is meaningful info (never emit None/empty to clear UI)
             if isinstance(matchup_info, dict):
                 self.matchup_data_updated.emit(matchup_info)
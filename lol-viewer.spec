@@ -30,6 +30,7 @@ a = Analysis(
         'logger',
         'updater',
         'constants',
+        'app_cache',
         'main_window',
         'widgets',
         'widgets.status_widget',
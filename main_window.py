@@ -6,7 +6,9 @@ import sys
 import logging
 import os
 import re
+import threading
 from datetime import datetime
+from types import MappingProxyType
 from typing import List, Optional
 
 from PyQt6.QtCore import QUrl, pyqtSignal, Qt, QTimer, QSettings, QByteArray, QSize
@@ -26,8 +28,8 @@ from constants import (
     UI_SIZE_PRESETS, get_ui_sizes,
 )
 from widgets import (
-    LCUConnectionStatusWidget, NullWebView, QrCodeOverlay,
-    _install_qr_overlay, _webengine_disabled,
+    LCUConnectionStatusWidget, QrCodeOverlay,
+    _install_qr_overlay, create_web_view, preload_webengine,
     ViewerListItemWidget, PendingPickListItemWidget, ChampionViewerWidget,
     DraggableMatchupLabel, MatchupRowWidget,
 )
@@ -35,8 +37,6 @@ from champion_data import ChampionData, ChampionImageCache, setup_champion_input
 from logger import log
 from lcu_detector import ChampionDetectorService
 
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-
 
 def _lcu_service_disabled() -> bool:
     """Whether background LCU polling should be disabled (e.g., tests)."""
@@ -111,11 +111,17 @@ logger = logging.getLogger(__name__)
 class MainWindow(QMainWindow):
     MAX_VIEWERS = 20  # Maximum number of viewers allowed
 
+    # (has_update, release_info, error) from the background latest-version check
+    _latest_version_checked = pyqtSignal(bool, object, str)
+
     def __init__(self):
         super().__init__()
         self.viewers = []  # List of all viewer widgets
         self.hidden_viewers = []  # List of hidden viewer widgets
         self.pending_enemy_picks: list[str] = []  # Enemy picks waiting for user to open
+        # (payload key, ally rows, enemy rows) of the last applied matchup update;
+        # the detector re-emits unchanged data on every poll
+        self._matchup_last_applied: tuple | None = None
         self.next_viewer_id = 0  # Counter for assigning viewer IDs
         self.champion_data = ChampionData()  # Load champion data
 
@@ -154,6 +160,7 @@ class MainWindow(QMainWindow):
         self._latest_version_check_inflight: bool = False
         self._latest_version_check_done: bool = False
         self._latest_version_check_force: bool = False
+        self._latest_version_checked.connect(self._on_latest_version_checked)
 
         # Cache for Settings tab "new version" indicator dot icon
         self._settings_new_version_dot_icon_cache_key: Optional[tuple] = None
@@ -322,7 +329,7 @@ class MainWindow(QMainWindow):
         live_game_layout.setContentsMargins(0, 0, 0, 0)
 
         # WebView using configured live game URL
-        self.live_game_web_view = NullWebView() if _webengine_disabled() else QWebEngineView()
+        self.live_game_web_view = create_web_view()
         self.live_game_web_view.page().setBackgroundColor(QColor("#0d1117"))
         self.live_game_web_view.setUrl(QUrl(self.live_game_url))
         live_game_layout.addWidget(self.live_game_web_view)
@@ -1313,7 +1320,9 @@ class MainWindow(QMainWindow):
         self._matchup_image_cache = ChampionImageCache()
         # Each row: (ally_icon, ally_name, enemy_name, enemy_icon)
         self._matchup_rows: list[tuple[QLabel, QLabel, QLabel, QLabel]] = []
-        self._matchup_data: list[tuple[str, str]] = [("", "")] * 5  # (ally, enemy)
+        # Row state kept as parallel lists so swaps don't rebuild tuples
+        self._ally_names: list[str] = [""] * 5
+        self._enemy_names: list[str] = [""] * 5
         self._matchup_row_widgets: list[MatchupRowWidget] = []
 
         icon_size = sz["icon_size_matchup"]
@@ -1438,7 +1447,10 @@ class MainWindow(QMainWindow):
         """Refresh the matchup list widget from current matchup data."""
         try:
             for i, (ally_icon, ally_name, enemy_name, enemy_icon) in enumerate(self._matchup_rows):
-                ally, enemy = self._matchup_data[i] if i < len(self._matchup_data) else ("", "")
+                if i < len(self._ally_names):
+                    ally, enemy = self._ally_names[i], self._enemy_names[i]
+                else:
+                    ally = enemy = ""
                 try:
                     ally_name.setText(ally if ally else "-")
                     enemy_name.setText(enemy if enemy else "-")
@@ -1449,26 +1461,43 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error updating matchup list: {e}")
 
+    @property
+    def _matchup_data(self) -> list[tuple[str, str]]:
+        """Matchup rows as (ally, enemy) pairs, built from the parallel name lists."""
+        return list(zip(self._ally_names, self._enemy_names))
+
+    @_matchup_data.setter
+    def _matchup_data(self, rows) -> None:
+        self._ally_names = [ally for ally, _ in rows]
+        self._enemy_names = [enemy for _, enemy in rows]
+
+    def _reset_matchup_rows(self):
+        """Empty all five matchup rows."""
+        self._ally_names = [""] * 5
+        self._enemy_names = [""] * 5
+
     def set_matchup_entry(self, index: int, ally: str = "", enemy: str = ""):
         """Set a single matchup row (0-4)."""
         if 0 <= index < 5:
-            self._matchup_data[index] = (ally, enemy)
+            self._ally_names[index] = ally
+            self._enemy_names[index] = enemy
             self.update_matchup_list()
 
     # Lane name → row index mapping for placing allies by assigned lane
-    LANE_TO_INDEX = {"top": 0, "jungle": 1, "middle": 2, "bottom": 3, "support": 4}
+    # (read-only; lanes arrive already lower-cased from the detector)
+    LANE_TO_INDEX = MappingProxyType({"top": 0, "jungle": 1, "middle": 2, "bottom": 3, "support": 4})
     # Row index → champions.json lane key mapping for enemy placement by aptitude
     INDEX_TO_LANE_JSON = ["top", "jg", "mid", "bot", "sup"]
 
     def clear_matchup_list(self):
         """Clear all matchup entries."""
-        self._matchup_data = [("", "")] * 5
+        self._reset_matchup_rows()
         self.pending_enemy_picks.clear()
         self.update_matchup_list()
 
     def _refresh_matchup_list(self):
         """Refresh button handler: clear all matchup data and trigger re-fetch."""
-        self._matchup_data = [("", "")] * 5
+        self._reset_matchup_rows()
         self.pending_enemy_picks.clear()
         self.update_matchup_list()
         # Trigger immediate re-check from detector
@@ -1490,9 +1519,24 @@ class MainWindow(QMainWindow):
             return
 
         try:
+            key = (
+                bool(data.get("is_new_session")),
+                tuple(tuple(a) for a in data.get("allies", [])),
+                tuple(data.get("enemies", [])),
+            )
+            last = self._matchup_last_applied
+            if (
+                last is not None
+                and last[0] == key
+                and last[1] == self._ally_names
+                and last[2] == self._enemy_names
+            ):
+                # Same payload onto the same rows → placement would be a no-op
+                return
+
             # New ChampSelect session → auto-clear before applying new data
             if data.get("is_new_session"):
-                self._matchup_data = [("", "")] * 5
+                self._reset_matchup_rows()
                 self.pending_enemy_picks.clear()
 
             allies = data.get("allies", [])
@@ -1501,6 +1545,7 @@ class MainWindow(QMainWindow):
             self._apply_new_allies(allies)
             self._apply_new_enemies(enemies)
             self.update_matchup_list()
+            self._matchup_last_applied = (key, list(self._ally_names), list(self._enemy_names))
         except Exception as e:
             logger.error(f"Error processing matchup data: {e}")
 
@@ -1511,31 +1556,42 @@ class MainWindow(QMainWindow):
         - Lane-assigned allies are placed first (in their lane row).
         - Then no-lane allies fill the first empty ally slot.
         """
-        # Partition: lane-assigned first, then no-lane
-        with_lane = [(n, l) for n, l in allies if n and l and l in self.LANE_TO_INDEX]
-        without_lane = [(n, l) for n, l in allies if n and (not l or l not in self.LANE_TO_INDEX)]
+        # Partition: lane-assigned first, then no-lane (one lookup per ally)
+        lane_to_index = self.LANE_TO_INDEX
+        with_lane = []
+        without_lane = []
+        for name, lane in allies:
+            if not name:
+                continue
+            lane_idx = lane_to_index.get(lane) if lane else None
+            if lane_idx is None:
+                without_lane.append(name)
+            else:
+                with_lane.append((name, lane_idx))
+
+        allies_row = self._ally_names
+        # Presence set and ascending empty-row list are built once per update
+        # and kept in step with each placement below
+        placed = set(allies_row)
+        empty_indices = [i for i in range(5) if not allies_row[i]]
 
         # Pass 1: place lane-assigned allies
-        for name, lane in with_lane:
-            if any(self._matchup_data[i][0] == name for i in range(5)):
+        for name, lane_idx in with_lane:
+            if name in placed or not empty_indices:
                 continue
-            lane_idx = self.LANE_TO_INDEX[lane]
-            if not self._matchup_data[lane_idx][0]:
-                _, enemy = self._matchup_data[lane_idx]
-                self._matchup_data[lane_idx] = (name, enemy)
+            if not allies_row[lane_idx]:
+                idx = lane_idx
             else:
                 # Lane row occupied → first empty ally slot
-                for i in range(5):
-                    if not self._matchup_data[i][0]:
-                        _, enemy = self._matchup_data[i]
-                        self._matchup_data[i] = (name, enemy)
-                        break
+                idx = empty_indices[0]
+            allies_row[idx] = name
+            placed.add(name)
+            empty_indices.remove(idx)
 
         # Pass 2: place no-lane allies by lane aptitude (or first empty slot as fallback)
-        for name, _ in without_lane:
-            if any(self._matchup_data[i][0] == name for i in range(5)):
+        for name in without_lane:
+            if name in placed:
                 continue
-            empty_indices = [i for i in range(5) if not self._matchup_data[i][0]]
             if not empty_indices:
                 break
             best_idx = empty_indices[0]
@@ -1553,8 +1609,9 @@ class MainWindow(QMainWindow):
                     if score > best_score:
                         best_score = score
                         best_idx = i
-            _, enemy = self._matchup_data[best_idx]
-            self._matchup_data[best_idx] = (name, enemy)
+            allies_row[best_idx] = name
+            placed.add(name)
+            empty_indices.remove(best_idx)
 
     def _apply_new_enemies(self, enemies: list):
         """Place new enemy champions into matchup rows based on lane aptitude.
@@ -1564,15 +1621,16 @@ class MainWindow(QMainWindow):
         - If aptitude data is unavailable, fall back to the first empty slot.
         - Ties are broken by row order (top → jungle → middle → bottom → support).
         """
+        enemies_row = self._enemy_names
+        placed = set(enemies_row)
+        # Empty row indices (ascending), shrunk as enemies are placed
+        empty_indices = [i for i in range(5) if not enemies_row[i]]
         for name in enemies:
             if not name:
                 continue
             # Already placed?
-            if any(self._matchup_data[i][1] == name for i in range(5)):
+            if name in placed:
                 continue
-
-            # Collect empty row indices
-            empty_indices = [i for i in range(5) if not self._matchup_data[i][1]]
             if not empty_indices:
                 break
 
@@ -1595,8 +1653,9 @@ class MainWindow(QMainWindow):
                         best_score = score
                         best_idx = i
 
-            ally, _ = self._matchup_data[best_idx]
-            self._matchup_data[best_idx] = (ally, name)
+            enemies_row[best_idx] = name
+            placed.add(name)
+            empty_indices.remove(best_idx)
 
     def _matchup_swap_enemies(self, index: int):
         """Swap the enemy champion between row *index* and the next row.
@@ -1606,10 +1665,8 @@ class MainWindow(QMainWindow):
         target = index + 1
         if target >= 5:
             return
-        ally_a, enemy_a = self._matchup_data[index]
-        ally_b, enemy_b = self._matchup_data[target]
-        self._matchup_data[index] = (ally_a, enemy_b)
-        self._matchup_data[target] = (ally_b, enemy_a)
+        names = self._enemy_names
+        names[index], names[target] = names[target], names[index]
         self.update_matchup_list()
 
     def _matchup_dnd_drop(self, source_index: int, target_index: int, side: str):
@@ -1618,16 +1675,13 @@ class MainWindow(QMainWindow):
             return
         if source_index < 0 or source_index >= 5 or target_index < 0 or target_index >= 5:
             return
-        ally_a, enemy_a = self._matchup_data[source_index]
-        ally_b, enemy_b = self._matchup_data[target_index]
         if side == "ally":
-            self._matchup_data[source_index] = (ally_b, enemy_a)
-            self._matchup_data[target_index] = (ally_a, enemy_b)
+            names = self._ally_names
         elif side == "enemy":
-            self._matchup_data[source_index] = (ally_a, enemy_b)
-            self._matchup_data[target_index] = (ally_b, enemy_a)
+            names = self._enemy_names
         else:
             return
+        names[source_index], names[target_index] = names[target_index], names[source_index]
         self.update_matchup_list()
 
     def _apply_matchup_dnd_state(self):
@@ -1649,14 +1703,12 @@ class MainWindow(QMainWindow):
         if not name:
             return
         for i in range(5):
-            if side == "ally" and not self._matchup_data[i][0]:
-                _, enemy = self._matchup_data[i]
-                self._matchup_data[i] = (name, enemy)
+            if side == "ally" and not self._ally_names[i]:
+                self._ally_names[i] = name
                 self._debug_status_label.setText(f"Added {name} as ally to row {i}")
                 break
-            elif side == "enemy" and not self._matchup_data[i][1]:
-                ally, _ = self._matchup_data[i]
-                self._matchup_data[i] = (ally, name)
+            elif side == "enemy" and not self._enemy_names[i]:
+                self._enemy_names[i] = name
                 self._debug_status_label.setText(f"Added {name} as enemy to row {i}")
                 break
         else:
@@ -1672,9 +1724,9 @@ class MainWindow(QMainWindow):
         Reuses the same logic as the Build button.
         """
         try:
-            if index < 0 or index >= len(self._matchup_data):
+            if index < 0 or index >= len(self._ally_names):
                 return
-            ally, enemy = self._matchup_data[index]
+            ally, enemy = self._ally_names[index], self._enemy_names[index]
             if not ally:
                 return
             lane = self.MATCHUP_LANE_ORDER[index] if index < len(self.MATCHUP_LANE_ORDER) else ""
@@ -2167,13 +2219,13 @@ class MainWindow(QMainWindow):
         """
         # Prefer enemy picks from Current Matchup data
         try:
-            matchup_data = self._matchup_data
+            enemy_names = self._enemy_names
         except RuntimeError:
-            matchup_data = []
-        if matchup_data:
+            enemy_names = []
+        if enemy_names:
             enemies: List[str] = []
             seen: set = set()
-            for _ally, enemy in matchup_data:
+            for enemy in enemy_names:
                 if not enemy:
                     continue
                 normalized = enemy.lower()
@@ -2192,12 +2244,10 @@ class MainWindow(QMainWindow):
             if exclude_viewer is not None and viewer is exclude_viewer:
                 continue
 
-            candidates = [
+            for name in (
                 getattr(viewer, "current_champion", ""),
                 getattr(viewer, "current_opponent_champion", ""),
-            ]
-
-            for name in candidates:
+            ):
                 if not name:
                     continue
                 normalized = name.lower()
@@ -2413,13 +2463,31 @@ class MainWindow(QMainWindow):
         self._latest_version_check_inflight = True
         self._latest_version_check_force = False
 
+        # The request can take seconds; run it off the GUI thread and apply the
+        # result in _on_latest_version_checked (queued back via the signal)
+        threading.Thread(target=self._run_latest_version_check, name="update-check",
+                         daemon=True).start()
+
+    def _run_latest_version_check(self):
+        """Worker-thread body of check_latest_version (no widget access here)"""
         try:
             from updater import Updater
-            updater = Updater(__version__, parent_widget=self.settings_page)
-
-            has_update, release_info = updater.check_for_updates()
+            has_update, release_info = Updater(__version__).check_for_updates()
+            result = (bool(has_update), release_info, "")
+        except Exception as e:
+            result = (False, None, str(e) or type(e).__name__)
+        try:
+            self._latest_version_checked.emit(*result)
+        except RuntimeError:
+            # Window already destroyed
+            pass
 
-            if release_info:
+    def _on_latest_version_checked(self, has_update: bool, release_info, error: str):
+        """Show the result of the background latest-version check"""
+        try:
+            if error:
+                self._show_latest_version_error(error)
+            elif release_info:
                 latest_version = release_info.get('tag_name', 'Unknown').lstrip('v')
                 self.latest_version_label.setText(f"Latest version: {latest_version}")
 
@@ -2462,24 +2530,28 @@ class MainWindow(QMainWindow):
                 """)
 
         except Exception as e:
-            sz = get_ui_sizes(QSettings("LoLViewer", "LoLViewer").value("display/ui_size", "medium"))
-            logger.error(f"Error checking for updates: {e}")
-            self.latest_version_label.setText("Latest version: Error")
-            self.status_label.setText(f"✗ Error: {str(e)}")
-            self.status_label.setStyleSheet(f"""
-                QLabel {{
-                    font-size: {sz['font_base']};
-                    color: #e0342c;
-                    background-color: transparent;
-                    padding: 5px;
-                }}
-            """)
-            self._set_settings_tab_new_version_indicator(False)
+            self._show_latest_version_error(str(e))
 
         finally:
             self._latest_version_check_inflight = False
             self._latest_version_check_done = True
 
+    def _show_latest_version_error(self, message: str):
+        """Show a failed latest-version check in the Settings page"""
+        sz = get_ui_sizes(QSettings("LoLViewer", "LoLViewer").value("display/ui_size", "medium"))
+        logger.error(f"Error checking for updates: {message}")
+        self.latest_version_label.setText("Latest version: Error")
+        self.status_label.setText(f"✗ Error: {message}")
+        self.status_label.setStyleSheet(f"""
+            QLabel {{
+                font-size: {sz['font_base']};
+                color: #e0342c;
+                background-color: transparent;
+                padding: 5px;
+            }}
+        """)
+        self._set_settings_tab_new_version_indicator(False)
+
     def check_for_updates(self):
         """Manual update check with full update flow"""
         self.update_button.setEnabled(False)
@@ -2532,6 +2604,7 @@ def main():
         logger.info(f"Debug mode: {is_debug}")
         logger.info("=" * 60)
 
+        preload_webengine()
         app = QApplication(sys.argv)
         logger.info("QApplication created")
 
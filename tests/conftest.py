@@ -0,0 +1,108 @@
+"""Shared pytest fixtures"""
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+# Headless-friendly defaults for CI environments (no display server).
+ENV_DEFAULTS = {
+    "QT_QPA_PLATFORM": "offscreen",
+    "QT_OPENGL": "software",
+    "QTWEBENGINE_DISABLE_SANDBOX": "1",
+    "QTWEBENGINE_CHROMIUM_FLAGS": "--no-sandbox --disable-gpu",
+    "LOL_VIEWER_DISABLE_WEBENGINE": "1",
+    "LOL_VIEWER_DISABLE_LCU_SERVICE": "1",
+    "LOL_VIEWER_DISABLE_DIALOGS": "1",
+    # Per-run app cache, so tests never read or write the user's real one
+    "LOL_VIEWER_CACHE_DIR": tempfile.mkdtemp(prefix="lol-viewer-test-cache-"),
+}
+
+
+# Fixtures that imply a live QApplication
+QT_FIXTURES = frozenset(("qapp", "qtbot"))
+
+
+def pytest_configure(config):
+    """Apply ENV_DEFAULTS once, before any test module imports Qt"""
+    for key, value in ENV_DEFAULTS.items():
+        os.environ.setdefault(key, value)
+
+
+def pytest_unconfigure(config):
+    """Remove the per-run cache directory created for ENV_DEFAULTS"""
+    shutil.rmtree(ENV_DEFAULTS["LOL_VIEWER_CACHE_DIR"], ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark each test ``qt`` or ``pure`` depending on whether it needs a QApplication"""
+    for item in items:
+        needs_qt = QT_FIXTURES.intersection(getattr(item, "fixturenames", ()))
+        item.add_marker(pytest.mark.qt if needs_qt else pytest.mark.pure)
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Create (or reuse) the QApplication shared by every Qt test"""
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+    # No need to quit, pytest-qt handles it
+
+
+@contextmanager
+def _no_champion_map_fetch():
+    """Stub out the Data Dragon fetch of every ChampionDetector built inside"""
+    from lcu_detector import ChampionDetector
+    with patch.object(ChampionDetector, '_load_champion_map', lambda self: None):
+        yield
+        # Let loader threads started under the stub finish before it is removed
+        for thread in threading.enumerate():
+            if thread.name == "champion-map":
+                thread.join(5)
+
+
+@pytest.fixture(autouse=True)
+def offline_champion_map(request):
+    """Qt tests build MainWindow/ChampionDetectorService; keep them off the network"""
+    if QT_FIXTURES.intersection(request.fixturenames):
+        with _no_champion_map_fetch():
+            yield
+    else:
+        yield
+
+
+@pytest.fixture(scope='session')
+def champion_data():
+    """ChampionData parsed once per run (tests treat it as read-only)"""
+    from champion_data import ChampionData
+    return ChampionData()
+
+
+@pytest.fixture(scope='module')
+def main_window_ro(qapp):
+    """MainWindow shared by the read-only tests of a module (do not mutate)"""
+    from main_window import MainWindow
+    with _no_champion_map_fetch():
+        return MainWindow()
+
+
+@pytest.fixture(scope='module')
+def viewer_ro(qapp, champion_data):
+    """ChampionViewerWidget shared by the read-only tests of a module (do not mutate)"""
+    from widgets import ChampionViewerWidget
+    return ChampionViewerWidget(0, champion_data)
+
+
+@pytest.fixture(scope='session')
+def champion_map():
+    """Champion ID to name mapping covering every ID used by the LCU tests"""
+    return {
+        22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
+        222: 'Jinx', 238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
+    }
@@ -40,7 +40,7 @@ def test_champion_data_module():
     # Test English name search
     results = search_champions(champions, "ashe")
     assert len(results) > 0, "English name search failed"
-    assert any(r['id'] == 'ashe' for r in results), "Ashe not found in English search"
+    assert 'ashe' in {r['id'] for r in results}, "Ashe not found in English search"
     print(f"[OK] English name search works: found {len(results)} results for 'ashe'")
 
     # Test Japanese name search
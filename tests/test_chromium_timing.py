@@ -18,17 +18,7 @@ from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Headless-friendly defaults for CI environments (no display server).
-os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
-os.environ.setdefault("QT_OPENGL", "software")
-os.environ.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
-os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--no-sandbox --disable-gpu")
-os.environ.setdefault("LOL_VIEWER_DISABLE_WEBENGINE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_LCU_SERVICE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_DIALOGS", "1")
-
 import pytest
-from PyQt6.QtWidgets import QApplication
 from main_window import MainWindow
 
 # ---------------------------------------------------------------------------
@@ -158,15 +148,6 @@ class TestASTPatterns:
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(scope="session")
-def qapp():
-    """Return (or create) the QApplication instance."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-
-
 @pytest.fixture(scope="module")
 def window(qapp):
     """Return a single MainWindow for behavior tests."""
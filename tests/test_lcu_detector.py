@@ -2,12 +2,21 @@
 """
 Test cases for LCU Champion Detector
 """
+import base64
+import copy
+import json
 import os
 import sys
+import threading
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import psutil
 import pytest
+import requests
+from PyQt6.QtCore import QTimer
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from lcu_detector import (
     LCUConnectionManager,
@@ -17,6 +26,57 @@ from lcu_detector import (
 )
 
 
+def _mgr(**kw):
+    """Lightweight LCUConnectionManager stub; kwargs configure make_request"""
+    return SimpleNamespace(make_request=MagicMock(**kw))
+
+
+def _response(json_data=None, status_code=200, headers=None):
+    """Mock requests.Response"""
+    response = Mock(spec=requests.Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = json.dumps(json_data).encode() if json_data is not None else b''
+    return response
+
+
+def _pt(phase='None', data=None):
+    """Lightweight GamePhaseTracker stub reporting *phase*"""
+    ns = SimpleNamespace(update_phase=MagicMock(return_value=phase), last_session_data=data)
+    ns.is_in_champ_select = lambda: ns.update_phase.return_value == 'ChampSelect'
+    ns.is_in_game = lambda: ns.update_phase.return_value == 'InProgress'
+    return ns
+
+
+@pytest.fixture(scope='module')
+def full_session():
+    """Gameflow session with all 10 champions locked in (treat as read-only)"""
+    return {
+        'gameData': {
+            'teamOne': [
+                {'summonerId': 100, 'championId': 22},
+                {'summonerId': 101, 'championId': 51},
+                {'summonerId': 102, 'championId': 86},
+                {'summonerId': 103, 'championId': 99},
+                {'summonerId': 104, 'championId': 40},
+            ],
+            'teamTwo': [
+                {'summonerId': 200, 'championId': 238},
+                {'summonerId': 201, 'championId': 157},
+                {'summonerId': 202, 'championId': 67},
+                {'summonerId': 203, 'championId': 63},
+                {'summonerId': 204, 'championId': 37},
+            ],
+        }
+    }
+
+
+@pytest.fixture
+def detector(champion_map):
+    """ChampionDetector with an injected champion map (no Data Dragon fetch)"""
+    return ChampionDetector(_mgr(), _pt(), champion_map=champion_map)
+
+
 class TestLCUConnectionManager:
     """Test cases for LCUConnectionManager"""
 
@@ -24,7 +84,7 @@ class TestLCUConnectionManager:
     def test_get_credentials_success(self, mock_process_iter):
         """Test successful credential retrieval from process"""
         # Mock process with LCU command line
-        mock_proc = Mock()
+        mock_proc = Mock(spec=psutil.Process)
         mock_proc.info = {
             'name': 'LeagueClientUx.exe',
             'cmdline': [
@@ -43,6 +103,18 @@ class TestLCUConnectionManager:
         assert manager.password == 'test-token-123'
         assert manager.connected is True
 
+    @pytest.mark.parametrize('cmdline,expected', [
+        (['LeagueClientUx.exe', '--remoting-auth-token=tok', '--app-port=12345', '--app-port=1'],
+         {'port': '12345', 'password': 'tok'}),
+        (['--app-port=abc', '--remoting-auth-token=tok'], None),
+        (['--app-port=12345', '--remoting-auth-token='], None),
+        (['--app-port-extra=12345', '--remoting-auth-token=tok'], None),
+        (None, None),
+    ])
+    def test_parse_credentials(self, cmdline, expected):
+        """Test extracting the port/token flags from a client command line"""
+        assert LCUConnectionManager._parse_credentials(cmdline) == expected
+
     @patch('lcu_detector.psutil.process_iter')
     def test_get_credentials_no_process(self, mock_process_iter):
         """Test credential retrieval when process not found"""
@@ -57,7 +129,7 @@ class TestLCUConnectionManager:
     @patch('lcu_detector.psutil.process_iter')
     def test_is_client_running_true(self, mock_process_iter):
         """Test client running detection when client is running"""
-        mock_proc = Mock()
+        mock_proc = Mock(spec=psutil.Process)
         mock_proc.info = {'name': 'LeagueClientUx.exe'}
         mock_process_iter.return_value = [mock_proc]
 
@@ -72,6 +144,48 @@ class TestLCUConnectionManager:
         manager = LCUConnectionManager()
         assert manager.is_client_running() is False
 
+    @patch('lcu_detector.psutil.pid_exists', return_value=False)
+    @patch('lcu_detector.psutil.process_iter')
+    def test_is_client_running_cached(self, mock_process_iter, mock_pid_exists):
+        """Test that back-to-back checks reuse a single process scan"""
+        mock_proc = Mock(spec=psutil.Process, pid=4321)
+        mock_proc.info = {'name': 'LeagueClientUx.exe'}
+        mock_process_iter.return_value = [mock_proc]
+
+        manager = LCUConnectionManager()
+        assert manager.is_client_running() is True
+        assert manager.is_client_running() is True
+        assert mock_process_iter.call_count == 1
+        mock_pid_exists.assert_not_called()
+
+        # Bypassing the cache re-checks; the remembered PID is gone -> rescan
+        mock_process_iter.return_value = []
+        assert manager.is_client_running(use_cache=False) is False
+        mock_pid_exists.assert_called_once_with(4321)
+        assert mock_process_iter.call_count == 2
+
+    @patch('lcu_detector.psutil.pid_exists', return_value=True)
+    @patch('lcu_detector.psutil.process_iter')
+    def test_client_pid_reused_across_polls(self, mock_process_iter, mock_pid_exists):
+        """Test that a live client PID replaces the process scan on later polls"""
+        mock_proc = Mock(spec=psutil.Process, pid=4321)
+        mock_proc.info = {
+            'name': 'LeagueClientUx.exe',
+            'cmdline': ['LeagueClientUx.exe', '--app-port=12345', '--remoting-auth-token=tok'],
+        }
+        mock_process_iter.return_value = [mock_proc]
+
+        manager = LCUConnectionManager()
+        assert manager.connect() is True
+        for _ in range(5):
+            assert manager.is_client_running(use_cache=False) is True
+        manager.connected = False
+        assert manager.connect() is True
+
+        assert mock_process_iter.call_count == 1
+        assert manager.port == '12345'
+        assert manager.password == 'tok'
+
     def test_get_auth_header(self):
         """Test authorization header generation"""
         manager = LCUConnectionManager()
@@ -81,34 +195,58 @@ class TestLCUConnectionManager:
         assert header.startswith('Basic ')
         assert 'riot:test-password' in header or header  # Base64 encoded
 
-    @patch('lcu_detector.requests.get')
-    def test_make_request_success(self, mock_get):
+    def test_get_auth_header_cached_per_password(self):
+        """Test that the header is reused until the password changes"""
+        manager = LCUConnectionManager()
+        manager.password = 'first'
+        first = manager.get_auth_header()
+        assert manager.get_auth_header() is first
+
+        manager.password = 'second'
+        second = manager.get_auth_header()
+        assert second != first
+        assert second == 'Basic ' + base64.b64encode(b'riot:second').decode()
+
+    def test_make_request_success(self):
         """Test successful API request"""
         manager = LCUConnectionManager()
         manager.connected = True
         manager.port = '12345'
         manager.password = 'test-password'
 
-        mock_response = Mock()
+        mock_response = Mock(spec=requests.Response)
         mock_response.status_code = 200
-        mock_response.json.return_value = {'phase': 'ChampSelect'}
-        mock_get.return_value = mock_response
+        mock_response.content = b'{"phase": "ChampSelect"}'
+        manager._session = Mock(spec=requests.Session)
+        manager._session.get.return_value = mock_response
 
         result = manager.make_request('/test-endpoint')
 
         assert result == {'phase': 'ChampSelect'}
-        mock_get.assert_called_once()
+        manager._session.get.assert_called_once()
 
-    @patch('lcu_detector.requests.get')
-    def test_make_request_not_connected(self, mock_get):
+    def test_make_request_not_connected(self):
         """Test API request when not connected"""
         manager = LCUConnectionManager()
         manager.connected = False
+        manager._session = Mock(spec=requests.Session)
 
         result = manager.make_request('/test-endpoint')
 
         assert result is None
-        mock_get.assert_not_called()
+        manager._session.get.assert_not_called()
+
+    def test_session_reused_and_closed(self):
+        """Test that one keep-alive session serves all requests until close()"""
+        manager = LCUConnectionManager()
+        session = manager._get_session()
+        assert manager._get_session() is session
+        assert session.verify is False
+
+        manager.close()
+        assert manager._session is None
+        assert manager._get_session() is not session
+        manager.close()
 
 
 class TestGamePhaseTracker:
@@ -116,15 +254,14 @@ class TestGamePhaseTracker:
 
     def test_initial_phase(self):
         """Test initial game phase"""
-        manager = Mock()
+        manager = _mgr()
         tracker = GamePhaseTracker(manager)
 
         assert tracker.current_phase == "None"
 
     def test_update_phase_success(self):
         """Test phase update with successful response"""
-        manager = Mock()
-        manager.make_request.return_value = {'phase': 'ChampSelect'}
+        manager = _mgr(return_value={'phase': 'ChampSelect'})
 
         tracker = GamePhaseTracker(manager)
         phase = tracker.update_phase()
@@ -132,13 +269,27 @@ class TestGamePhaseTracker:
         assert phase == 'ChampSelect'
         assert tracker.current_phase == 'ChampSelect'
 
+    def test_update_phase_uses_ttl_cache(self):
+        """Test that back-to-back updates within the TTL reuse the last phase"""
+        manager = _mgr(return_value={'phase': 'ChampSelect'})
+
+        tracker = GamePhaseTracker(manager)
+        assert tracker.update_phase() == 'ChampSelect'
+        assert tracker.update_phase() == 'ChampSelect'
+        manager.make_request.assert_called_once()
+
+        # Once the window has passed the session is queried again
+        tracker._phase_cache_ts -= tracker._phase_ttl
+        tracker.update_phase()
+        assert manager.make_request.call_count == 2
+
     def test_update_phase_no_response_during_game_keeps_phase(self):
         """Test that transient API failure during InProgress keeps the phase"""
-        manager = Mock()
-        manager.make_request.return_value = None
+        manager = _mgr(return_value=None)
 
         tracker = GamePhaseTracker(manager)
         tracker.current_phase = 'InProgress'
+        tracker._phase_poll_stride = 1
         phase = tracker.update_phase()
 
         assert phase == 'InProgress'
@@ -146,8 +297,7 @@ class TestGamePhaseTracker:
 
     def test_update_phase_no_response_outside_game_resets(self):
         """Test that API failure outside of game resets phase to None"""
-        manager = Mock()
-        manager.make_request.return_value = None
+        manager = _mgr(return_value=None)
 
         tracker = GamePhaseTracker(manager)
         tracker.current_phase = 'Lobby'
@@ -156,9 +306,36 @@ class TestGamePhaseTracker:
         assert phase == 'None'
         assert tracker.current_phase == 'None'
 
+    def test_update_phase_throttled_in_progress(self):
+        """Test that InProgress only queries the session every Nth call"""
+        manager = _mgr(return_value={'phase': 'InProgress'})
+
+        tracker = GamePhaseTracker(manager)
+        tracker._phase_poll_stride = 5
+        tracker._phase_ttl = 0
+        assert tracker.update_phase() == 'InProgress'
+        assert manager.make_request.call_count == 1
+
+        for _ in range(4):
+            assert tracker.update_phase() == 'InProgress'
+        assert manager.make_request.call_count == 1
+
+        tracker.update_phase()
+        assert manager.make_request.call_count == 2
+
+        # Leaving InProgress is seen on the next stride boundary; after that
+        # every call polls again
+        manager.make_request.return_value = {'phase': 'EndOfGame'}
+        for _ in range(5):
+            tracker.update_phase()
+        assert tracker.current_phase == 'EndOfGame'
+        assert manager.make_request.call_count == 3
+        tracker.update_phase()
+        assert manager.make_request.call_count == 4
+
     def test_is_in_champ_select(self):
         """Test champion select detection"""
-        manager = Mock()
+        manager = _mgr()
         tracker = GamePhaseTracker(manager)
 
         tracker.current_phase = 'ChampSelect'
@@ -169,7 +346,7 @@ class TestGamePhaseTracker:
 
     def test_is_in_game(self):
         """Test in-game detection"""
-        manager = Mock()
+        manager = _mgr()
         tracker = GamePhaseTracker(manager)
 
         tracker.current_phase = 'InProgress'
@@ -183,85 +360,205 @@ class TestChampionDetector:
     """Test cases for ChampionDetector"""
 
     @patch('lcu_detector.requests.get')
-    def test_load_champion_map_success(self, mock_get):
+    def test_load_champion_map_success(self, mock_get, tmp_path, monkeypatch):
         """Test successful champion map loading"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
         # Mock version response
-        mock_version_response = Mock()
-        mock_version_response.json.return_value = ['13.24.1', '13.24.0']
+        mock_version_response = _response(['13.24.1', '13.24.0'])
 
         # Mock champion data response
-        mock_champion_response = Mock()
-        mock_champion_response.json.return_value = {
+        mock_champion_response = _response({
             'data': {
                 'Ashe': {'key': '22'},
                 'Jinx': {'key': '222'}
             }
-        }
+        })
 
         mock_get.side_effect = [mock_version_response, mock_champion_response]
 
-        manager = Mock()
-        phase_tracker = Mock()
+        manager = _mgr()
+        phase_tracker = _pt()
         detector = ChampionDetector(manager, phase_tracker)
+        assert detector.wait_for_champion_map(5)
 
         assert 22 in detector.champion_map
         assert detector.champion_map[22] == 'Ashe'
         assert 222 in detector.champion_map
         assert detector.champion_map[222] == 'Jinx'
 
-    def test_detect_champion_in_champ_select(self):
-        """Test champion detection in champ select"""
-        manager = Mock()
-        manager.make_request.return_value = {
-            'localPlayerCellId': 0,
-            'myTeam': [
-                {'cellId': 0, 'championId': 22}
-            ]
-        }
+    @patch('lcu_detector.requests.get')
+    def test_load_champion_map_uses_disk_cache(self, mock_get, tmp_path, monkeypatch):
+        """Second detector reuses the cached version and champion map without HTTP"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+        mock_version_response = _response(['13.24.1'])
+        mock_champion_response = _response({
+            'data': {
+                'Ashe': {'key': '22'},
+                'MonkeyKing': {'key': '62'}
+            }
+        })
+        # Only two responses: any further request raises StopIteration
+        mock_get.side_effect = [mock_version_response, mock_champion_response]
 
-        phase_tracker = Mock()
-        phase_tracker.update_phase.return_value = 'ChampSelect'
+        first = ChampionDetector(_mgr(), _pt())
+        assert first.wait_for_champion_map(5)
+        second = ChampionDetector(_mgr(), _pt())
+        assert second.wait_for_champion_map(5)
 
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe'}
+        assert mock_get.call_count == 2
+        assert second.champion_map == first.champion_map
+        assert second.champion_map == {0: '', 22: 'Ashe', 62: 'Wukong'}
+        assert (tmp_path / 'champions-13.24.1.json').exists()
 
-        champion = detector.detect_champion()
+    @patch('lcu_detector.requests.get')
+    def test_load_champion_map_prefetch_hit(self, mock_get, tmp_path, monkeypatch):
+        """Stale version cache: champion map for the last version is used if still current"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+        version_file = tmp_path / 'ddragon-version.json'
+        version_file.write_text('{"version": "13.24.1"}')
+        (tmp_path / 'champions-13.24.1.json').write_text('{"22": "Ashe"}')
+        expired = time.time() - ChampionDetector._VERSION_CACHE_TTL - 60
+        os.utime(version_file, (expired, expired))
 
-        assert champion == 'Ashe'
-        assert detector.current_champion_name == 'Ashe'
+        mock_get.return_value = _response(['13.24.1', '13.24.0'])
 
-    def test_detect_champion_in_progress(self):
-        """Test champion detection in-game"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.update_phase.return_value = 'InProgress'
+        detector = ChampionDetector(_mgr(), _pt())
+        assert detector.wait_for_champion_map(5)
 
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.current_champion_name = 'Ashe'
+        # Only the versions request goes over the network
+        mock_get.assert_called_once()
+        assert mock_get.call_args[0][0].endswith('/api/versions.json')
+        assert detector.champion_map[22] == 'Ashe'
 
-        champion = detector.detect_champion()
+    @patch('lcu_detector.requests.get')
+    def test_load_champion_map_not_modified(self, mock_get, tmp_path, monkeypatch):
+        """Expired version cache revalidated with ETag: a 304 reuses the cached map"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+        version_file = tmp_path / 'ddragon-version.json'
+        version_file.write_text('{"version": "13.24.1", "etag": "W/\\"v1\\""}')
+        (tmp_path / 'champions-13.24.1.json').write_text('{"22": "Ashe"}')
+        expired = time.time() - ChampionDetector._VERSION_CACHE_TTL - 60
+        os.utime(version_file, (expired, expired))
+        mock_get.return_value = _response(status_code=304)
+
+        detector = ChampionDetector(_mgr(), _pt())
+        assert detector.wait_for_champion_map(5)
 
-        assert champion == 'Ashe'
+        mock_get.assert_called_once()
+        assert mock_get.call_args[1]['headers'] == {'If-None-Match': 'W/"v1"'}
+        # The empty 304 body is never decoded (it would raise and empty the map)
+        assert detector.champion_map[22] == 'Ashe'
+        # TTL window restarts after a successful revalidation
+        assert os.path.getmtime(version_file) > expired
 
-    def test_detect_champion_none_phase(self):
-        """Test champion detection when phase is None"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.update_phase.return_value = 'None'
+    @patch('lcu_detector.requests.get')
+    def test_load_champion_map_prefetch_miss(self, mock_get, tmp_path, monkeypatch):
+        """Stale version cache and a new patch: the prefetched map is discarded"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+        version_file = tmp_path / 'ddragon-version.json'
+        version_file.write_text('{"version": "13.24.1"}')
+        (tmp_path / 'champions-13.24.1.json').write_text('{"22": "Ashe"}')
+        expired = time.time() - ChampionDetector._VERSION_CACHE_TTL - 60
+        os.utime(version_file, (expired, expired))
+
+        def fake_get(url, headers=None, timeout=None):
+            if url.endswith('/api/versions.json'):
+                return _response(['14.1.1', '13.24.1'])
+            assert '/14.1.1/' in url
+            return _response({'data': {'Jinx': {'key': '222'}}})
+
+        mock_get.side_effect = fake_get
+        detector = ChampionDetector(_mgr(), _pt())
+        assert detector.wait_for_champion_map(5)
+
+        assert mock_get.call_count == 2
+        assert detector.champion_map[222] == 'Jinx'
+        assert 22 not in detector.champion_map
 
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.current_champion_name = 'Ashe'
+    @patch('lcu_detector.requests.get')
+    def test_load_champion_map_offline_uses_stale_cache(self, mock_get, tmp_path, monkeypatch):
+        """Stale version cache and no network: the last known version's map is kept"""
+        monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+        version_file = tmp_path / 'ddragon-version.json'
+        version_file.write_text('{"version": "14.1.1"}')
+        (tmp_path / 'champions-14.1.1.json').write_text('{"222": "Jinx"}')
+        expired = time.time() - ChampionDetector._VERSION_CACHE_TTL - 60
+        os.utime(version_file, (expired, expired))
+        mock_get.side_effect = requests.exceptions.ConnectionError("offline")
+
+        detector = ChampionDetector(_mgr(), _pt())
+        assert detector.wait_for_champion_map(5)
+
+        mock_get.assert_called_once()
+        assert detector.champion_map == {0: '', 222: 'Jinx'}
+        # Not revalidated, so the next start checks the version again
+        assert os.path.getmtime(version_file) == pytest.approx(expired)
+
+    def test_load_champion_map_does_not_block_init(self):
+        """Test that the Data Dragon fetch runs off the constructing thread"""
+        release = threading.Event()
+
+        def slow_load(detector):
+            release.wait(5)
+            detector.champion_map = {22: 'Ashe'}
+
+        manager = _mgr(return_value={'localPlayerCellId': 0, 'myTeam': [{'cellId': 0, 'championId': 22}]})
+        with patch.object(ChampionDetector, '_load_champion_map', slow_load):
+            detector = ChampionDetector(manager, _pt('ChampSelect'))
+            # __init__ returned while the load is still blocked
+            assert not detector.wait_for_champion_map(0)
+            # Polls skip name resolution until the map arrives
+            assert detector.detect_champion_and_enemies() == (None, [], None)
+            manager.make_request.assert_not_called()
+
+            release.set()
+            assert detector.wait_for_champion_map(5)
+        assert detector.detect_champion() == 'Ashe'
+
+    def test_champion_names_dense_table(self, detector):
+        """Test the dense ID -> name table behind champion_map"""
+        assert detector.champion_names[22] == 'Ashe'
+        assert detector.champion_names[0] == ''
+        assert len(detector.champion_names) == max(detector.champion_map) + 1
+        assert detector._champion_name(238) == 'Zed'
+        for cid in (0, None, -1, 100000):
+            assert detector._champion_name(cid) == ''
+        with pytest.raises(TypeError):
+            detector.champion_map[1] = 'Annie'
+
+    def test_uses_slots(self, detector):
+        """Detector, tracker and manager keep no per-instance __dict__"""
+        for obj in (detector, GamePhaseTracker(_mgr()), LCUConnectionManager()):
+            with pytest.raises(AttributeError):
+                obj.__dict__
+
+    @pytest.mark.parametrize('phase,expected,preset', [
+        ('ChampSelect', 'Ashe', None),
+        ('InProgress', 'Ashe', 'Ashe'),
+        ('None', None, 'Ashe'),
+    ])
+    def test_detect_champion(self, detector, phase, expected, preset):
+        """Test champion detection in champ select, in game and outside a game"""
+        detector.lcu_manager.make_request.return_value = {
+            'localPlayerCellId': 0,
+            'myTeam': [
+                {'cellId': 0, 'championId': 22}
+            ]
+        }
+        detector.phase_tracker.update_phase.return_value = phase
+        detector.current_champion_name = preset
 
         champion = detector.detect_champion()
 
-        assert champion is None
-        assert detector.current_champion_name is None
+        assert champion == expected
+        assert detector.current_champion_name == expected
 
 
+@patch.object(ChampionDetector, '_load_champion_map', lambda self: None)
 class TestChampionDetectorService:
-    """Test cases for ChampionDetectorService"""
+    """Test cases for ChampionDetectorService (the detector never fetches Data Dragon)"""
 
-    def test_initialization(self):
+    def test_initialization(self, qapp):
         """Test service initialization"""
         service = ChampionDetectorService()
 
@@ -271,7 +568,7 @@ class TestChampionDetectorService:
         assert service.last_champion is None
         assert service.running is False
 
-    def test_start_stop(self):
+    def test_start_stop(self, qapp):
         """Test starting and stopping the service"""
         service = ChampionDetectorService()
 
@@ -283,16 +580,36 @@ class TestChampionDetectorService:
         assert service.running is False
         assert service.timer.isActive() is False
 
+    def test_adaptive_interval_in_game(self, qapp):
+        """Test that polling slows down in game and returns to base afterwards"""
+        service = ChampionDetectorService()
+        service.running = True
+        service.timer = Mock(spec=QTimer)
+        service.lcu_manager = Mock(spec=LCUConnectionManager, connected=True)
+        service.lcu_manager.is_client_running.return_value = True
+        service.detector = Mock(spec=ChampionDetector, _matchup_pairs_locked=False)
+        service.detector.detect_champion_and_enemies.return_value = (
+            None, [], {"allies": [], "enemies": [], "phase": "InProgress", "is_new_session": False}
+        )
+        service.phase_tracker.current_phase = 'InProgress'
+
+        service._check_champion()
+        service.timer.start.assert_called_once_with(5000)
+        service._check_champion()
+        service.timer.start.assert_called_once_with(5000)
+
+        service.phase_tracker.current_phase = 'Lobby'
+        service.detector.detect_champion_and_enemies.return_value = (None, [], None)
+        service._check_champion()
+        service.timer.start.assert_called_with(2000)
+        assert service.current_interval_ms == 2000
+
 
 class TestMatchupPairs:
     """Test cases for matchup pair extraction"""
 
-    def test_get_matchup_pairs_from_champ_select_data(self):
+    def test_get_matchup_pairs_from_champ_select_data(self, detector):
         """Test matchup pairs from ChampSelect myTeam/theirTeam"""
-        manager = Mock()
-        phase_tracker = Mock()
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe', 51: 'Caitlyn', 238: 'Zed'}
 
         data = {
             'myTeam': [{'championId': 22}],
@@ -301,50 +618,45 @@ class TestMatchupPairs:
         pairs = detector.get_matchup_pairs_from_data(data)
         assert pairs == [('Ashe', 'Caitlyn'), ('', 'Zed')]
 
-    def test_get_matchup_pairs_unpicked(self):
+    def test_get_matchup_pairs_unpicked(self, detector):
         """Test that unpicked champions (id=0) show as empty string"""
-        manager = Mock()
-        phase_tracker = Mock()
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe'}
 
         data = {
             'myTeam': [{'championId': 22}, {'championId': 0}],
             'theirTeam': [{'championId': 0}, {'championId': 0}],
         }
+        assert detector.champion_map[0] == ''
         pairs = detector.get_matchup_pairs_from_data(data)
         assert pairs == [('Ashe', ''), ('', '')]
 
-    def test_get_matchup_pairs_from_gamedata_team_one(self):
+    def test_get_matchup_pairs_from_gamedata_team_one(self, champion_map):
         """Test matchup pairs from gameData when player is on teamOne"""
-        manager = Mock()
-        phase_tracker = Mock()
+        manager = _mgr()
+        phase_tracker = _pt()
         phase_tracker.last_session_data = {
             'gameData': {
                 'teamOne': [{'summonerId': 100, 'championId': 22}],
                 'teamTwo': [{'summonerId': 200, 'championId': 51}],
             }
         }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe', 51: 'Caitlyn'}
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
 
         pairs = detector.get_matchup_pairs_from_gamedata()
         assert len(pairs) == 5
         assert pairs[0] == ('Ashe', 'Caitlyn')
 
-    def test_get_matchup_pairs_from_gamedata_team_two(self):
+    def test_get_matchup_pairs_from_gamedata_team_two(self, champion_map):
         """Test matchup pairs from gameData when player is on teamTwo"""
-        manager = Mock()
-        phase_tracker = Mock()
+        manager = _mgr()
+        phase_tracker = _pt()
         phase_tracker.last_session_data = {
             'gameData': {
                 'teamOne': [{'summonerId': 200, 'championId': 51}],
                 'teamTwo': [{'summonerId': 100, 'championId': 22}],
             }
         }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe', 51: 'Caitlyn'}
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
 
         pairs = detector.get_matchup_pairs_from_gamedata()
@@ -352,80 +664,86 @@ class TestMatchupPairs:
         assert len(pairs) == 5
         assert pairs[0] == ('Ashe', 'Caitlyn')
 
-    def test_get_matchup_pairs_from_gamedata_no_session(self):
+    def test_summoner_team_index_rebuilt_only_for_new_session(self, detector):
+        """Test that the summonerId -> team index is cached per session payload"""
+        session = {
+            'gameData': {
+                'teamOne': [{'summonerId': 200, 'championId': 51}],
+                'teamTwo': [{'summonerId': 100, 'championId': 22}],
+            }
+        }
+        detector.phase_tracker.last_session_data = session
+        detector.current_summoner_id = 100
+
+        assert detector.get_matchup_pairs_from_gamedata()[0] == ('Ashe', 'Caitlyn')
+        index = detector._session_index_cache[1]
+        assert index == {100: 'teamTwo', 200: 'teamOne'}
+        detector.get_allies_from_gamedata()
+        assert detector._session_index_cache[1] is index
+
+        detector.phase_tracker.last_session_data = {'gameData': dict(session['gameData'])}
+        assert detector.get_allies_from_gamedata() == [('Ashe', '')]
+        assert detector._session_index_cache[1] is not index
+
+    def test_get_matchup_pairs_from_gamedata_no_session(self, detector):
         """Test matchup pairs when no session data is available"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.last_session_data = None
-        detector = ChampionDetector(manager, phase_tracker)
+        detector.phase_tracker.last_session_data = None
 
         assert detector.get_matchup_pairs_from_gamedata() == []
 
-    def test_detect_champion_and_enemies_clears_on_lobby(self):
+    def test_detect_champion_and_enemies_clears_on_lobby(self, detector):
         """Test that None/Lobby phase resets champion state (summoner_id etc.)"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.update_phase.return_value = 'Lobby'
-        detector = ChampionDetector(manager, phase_tracker)
+        detector.phase_tracker.update_phase.return_value = 'Lobby'
+        handler = detector._phase_handlers['Lobby'] = Mock(wraps=detector._handle_game_ended)
         detector.current_champion_name = 'Ashe'
         detector.current_summoner_id = 100
         # No locked pairs → returns None for matchup_info (UI should not be updated)
         result = detector.detect_champion_and_enemies()
         assert result == (None, [], None)
         assert detector.current_summoner_id is None
+        handler.assert_called_once_with('Lobby')
 
-    def test_detect_champion_and_enemies_in_progress_uses_gamedata(self):
+    def test_detect_champion_and_enemies_in_progress_uses_gamedata(self, champion_map):
         """Test that InProgress phase uses gameData for matchup info"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.update_phase.return_value = 'InProgress'
+        manager = _mgr()
+        phase_tracker = _pt('InProgress')
         phase_tracker.last_session_data = {
             'gameData': {
                 'teamOne': [{'summonerId': 100, 'championId': 22}],
                 'teamTwo': [{'summonerId': 200, 'championId': 51}],
             }
         }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {22: 'Ashe', 51: 'Caitlyn'}
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_champion_name = 'Ashe'
         detector.current_lane = 'bottom'
         detector.current_summoner_id = 100
 
+        handler = detector._phase_handlers['InProgress'] = Mock(wraps=detector._handle_in_progress)
+
         own, enemies, matchup_info = detector.detect_champion_and_enemies()
         assert own == ('Ashe', 'bottom')
         assert enemies == []
         assert matchup_info["phase"] == "InProgress"
         assert ("Ashe", "") in matchup_info["allies"]
         assert "Caitlyn" in matchup_info["enemies"]
+        handler.assert_called_once_with('InProgress')
 
+    def test_detect_champion_and_enemies_unknown_phase_keeps_state(self, detector):
+        """Test that phases without a handler keep the current champion state"""
+        detector.phase_tracker.update_phase.return_value = 'GameStart'
+        detector.current_champion_name = 'Ashe'
+        detector.current_lane = 'bottom'
 
-    def test_matchup_pairs_locked_after_10_champions(self):
+        assert detector.detect_champion_and_enemies() == (('Ashe', 'bottom'), [], None)
+        assert detector.current_champion_name == 'Ashe'
+
+
+    def test_matchup_pairs_locked_after_10_champions(self, champion_map, full_session):
         """Test that matchup pairs are locked once all 10 champions are confirmed"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 22},
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 238},
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {
-            22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
-            238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
-        }
+        manager = _mgr()
+        phase_tracker = _pt()
+        phase_tracker.last_session_data = full_session
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
 
         pairs = detector.get_matchup_pairs_from_gamedata()
@@ -433,133 +751,45 @@ class TestMatchupPairs:
         assert all(ally and enemy for ally, enemy in pairs)
         assert detector._matchup_pairs_locked is True
 
-    def test_locked_pairs_not_overwritten_by_incomplete_data(self):
-        """Test that once locked, incomplete API data does not overwrite the list"""
-        manager = Mock()
-        phase_tracker = Mock()
+    @pytest.mark.parametrize('followup', ['incomplete', 'none'])
+    def test_locked_pairs_not_overwritten(self, champion_map, full_session, followup):
+        """Test that once locked, incomplete or missing session data does not overwrite the list"""
+        manager = _mgr()
+        phase_tracker = _pt()
         # First call: full data
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 22},
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 238},
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {
-            22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
-            238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
-        }
+        phase_tracker.last_session_data = full_session
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
 
         original_pairs = detector.get_matchup_pairs_from_gamedata()
         assert detector._matchup_pairs_locked is True
 
-        # Second call: API returns incomplete data (first player championId=0)
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 0},  # Missing!
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 0},  # Missing!
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
+        if followup == 'incomplete':
+            # API returns incomplete data (first player of each team championId=0)
+            session = copy.deepcopy(full_session)
+            session['gameData']['teamOne'][0]['championId'] = 0
+            session['gameData']['teamTwo'][0]['championId'] = 0
+            phase_tracker.last_session_data = session
+        else:
+            # Session becomes None (transient failure)
+            phase_tracker.last_session_data = None
+
         locked_pairs = detector.get_matchup_pairs_from_gamedata()
         # Locked pairs must be identical to the original full list
         assert locked_pairs == original_pairs
+        assert isinstance(locked_pairs, tuple)
 
-    def test_locked_pairs_not_overwritten_by_none_session(self):
-        """Test that locked pairs survive when session data becomes None"""
-        manager = Mock()
-        phase_tracker = Mock()
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 22},
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 238},
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = {
-            22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
-            238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
-        }
-        detector.current_summoner_id = 100
-
-        original_pairs = detector.get_matchup_pairs_from_gamedata()
-        assert detector._matchup_pairs_locked is True
-
-        # Session becomes None (transient failure)
-        phase_tracker.last_session_data = None
-        pairs_after = detector.get_matchup_pairs_from_gamedata()
-        assert pairs_after == original_pairs
-
-    def test_locked_pairs_persist_through_lobby(self):
+    def test_locked_pairs_persist_through_lobby(self, champion_map, full_session):
         """Test that locked matchup pairs remain cached in Lobby after game ends.
 
         In the redesigned flow, detect_champion_and_enemies returns None for
         matchup_info in Lobby (UI preserves its own state). The lock/cache from
         get_matchup_pairs_from_gamedata is tested here directly.
         """
-        manager = Mock()
-        phase_tracker = Mock()
-        champion_map = {
-            22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
-            238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
-        }
-
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 22},
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 238},
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = champion_map
+        manager = _mgr()
+        phase_tracker = _pt()
+        phase_tracker.last_session_data = full_session
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
 
         # Lock via get_matchup_pairs_from_gamedata (legacy path still used for locking)
@@ -576,36 +806,13 @@ class TestMatchupPairs:
         assert detector._matchup_pairs_locked is True  # lock preserved
         assert detector._cached_matchup_pairs != []  # cache preserved
 
-    def test_lock_cleared_on_next_champ_select(self):
+    def test_lock_cleared_on_next_champ_select(self, champion_map, full_session):
         """Test that matchup lock/cache is cleared when a new ChampSelect starts"""
-        manager = Mock()
-        phase_tracker = Mock()
-        champion_map = {
-            22: 'Ashe', 51: 'Caitlyn', 86: 'Garen', 99: 'Lux', 40: 'Janna',
-            238: 'Zed', 157: 'Yasuo', 67: 'Vayne', 63: 'Brand', 37: 'Sona',
-        }
-
+        manager = _mgr()
+        phase_tracker = _pt()
         # 1) Lock via get_matchup_pairs_from_gamedata (simulates InProgress)
-        phase_tracker.last_session_data = {
-            'gameData': {
-                'teamOne': [
-                    {'summonerId': 100, 'championId': 22},
-                    {'summonerId': 101, 'championId': 51},
-                    {'summonerId': 102, 'championId': 86},
-                    {'summonerId': 103, 'championId': 99},
-                    {'summonerId': 104, 'championId': 40},
-                ],
-                'teamTwo': [
-                    {'summonerId': 200, 'championId': 238},
-                    {'summonerId': 201, 'championId': 157},
-                    {'summonerId': 202, 'championId': 67},
-                    {'summonerId': 203, 'championId': 63},
-                    {'summonerId': 204, 'championId': 37},
-                ],
-            }
-        }
-        detector = ChampionDetector(manager, phase_tracker)
-        detector.champion_map = champion_map
+        phase_tracker.last_session_data = full_session
+        detector = ChampionDetector(manager, phase_tracker, champion_map=champion_map)
         detector.current_summoner_id = 100
         detector.current_champion_name = 'Ashe'
         detector.current_lane = 'bottom'
@@ -632,8 +839,10 @@ class TestMatchupPairs:
 
     def test_phase_tracker_keeps_phase_during_transient_failure(self):
         """Test that phase tracker does not reset to None during InProgress API failure"""
-        manager = Mock()
+        manager = _mgr()
         tracker = GamePhaseTracker(manager)
+        tracker._phase_poll_stride = 1
+        tracker._phase_ttl = 0
 
         # Simulate being in InProgress
         manager.make_request.return_value = {'phase': 'InProgress'}
@@ -650,7 +859,7 @@ class TestMatchupPairs:
 
     def test_phase_tracker_resets_when_not_in_game(self):
         """Test that phase tracker resets to None when API fails outside of game"""
-        manager = Mock()
+        manager = _mgr()
         tracker = GamePhaseTracker(manager)
 
         # Not in game
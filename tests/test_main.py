@@ -3,89 +3,62 @@
 Test suite for LoL Viewer application
 """
 import os
+import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Headless-friendly defaults for CI environments (no display server).
-os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
-os.environ.setdefault("QT_OPENGL", "software")
-os.environ.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
-os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--no-sandbox --disable-gpu")
-os.environ.setdefault("LOL_VIEWER_DISABLE_WEBENGINE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_LCU_SERVICE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_DIALOGS", "1")
-
 import pytest
-from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
-from widgets import ChampionViewerWidget
+from widgets import ChampionViewerWidget, NullWebView
 from main_window import MainWindow
-from champion_data import ChampionData
-
-
-@pytest.fixture(scope="session")
-def qapp():
-    """Create QApplication instance for tests"""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    yield app
-    # No need to quit, pytest-qt handles it
-
-
-@pytest.fixture
-def champion_data():
-    """Create ChampionData instance for tests"""
-    return ChampionData()
 
 
 class TestChampionViewerWidget:
     """Tests for ChampionViewerWidget class"""
 
-    def test_get_lolalytics_build_url(self):
-        """Test build URL generation"""
-        url = ChampionViewerWidget.get_lolalytics_build_url("ashe")
-        assert url == "https://lolalytics.com/lol/ashe/build/"
-
-    def test_get_lolalytics_build_url_uppercase(self):
-        """Test build URL generation with uppercase input"""
-        url = ChampionViewerWidget.get_lolalytics_build_url("ASHE")
-        assert url == "https://lolalytics.com/lol/ASHE/build/"
-
-    def test_get_lolalytics_counter_url(self):
-        """Test counter URL generation"""
-        url = ChampionViewerWidget.get_lolalytics_counter_url("swain")
-        assert url == "https://lolalytics.com/lol/swain/counters/"
-
-    def test_get_lolalytics_counter_url_uppercase(self):
-        """Test counter URL generation with uppercase input"""
-        url = ChampionViewerWidget.get_lolalytics_counter_url("SWAIN")
-        assert url == "https://lolalytics.com/lol/SWAIN/counters/"
-
-    def test_widget_initialization(self, qapp, champion_data):
+    @pytest.mark.parametrize("method,name,expected", [
+        (ChampionViewerWidget.get_lolalytics_build_url, "ashe",
+         "https://lolalytics.com/lol/ashe/build/"),
+        (ChampionViewerWidget.get_lolalytics_build_url, "ASHE",
+         "https://lolalytics.com/lol/ASHE/build/"),
+        (ChampionViewerWidget.get_lolalytics_counter_url, "swain",
+         "https://lolalytics.com/lol/swain/counters/"),
+        (ChampionViewerWidget.get_lolalytics_counter_url, "SWAIN",
+         "https://lolalytics.com/lol/SWAIN/counters/"),
+    ])
+    def test_get_lolalytics_url(self, method, name, expected):
+        """Test build/counter URL generation keeps the given name as-is"""
+        assert method(name) == expected
+
+    def test_widget_initialization(self, viewer_ro):
         """Test widget can be initialized"""
-        widget = ChampionViewerWidget(0, champion_data)
+        widget = viewer_ro
         assert widget is not None
         assert widget.champion_input is not None
         assert widget.build_button is not None
         assert widget.counter_button is not None
         assert widget.web_view is not None
 
-    def test_widget_button_text(self, qapp, champion_data):
+    def test_widget_button_text(self, viewer_ro):
         """Test button text is correct"""
-        widget = ChampionViewerWidget(0, champion_data)
+        widget = viewer_ro
         assert widget.build_button.text() == "Build"
         assert widget.counter_button.text() == "Counter"
 
-    def test_widget_placeholder_text(self, qapp, champion_data):
+    def test_widget_placeholder_text(self, viewer_ro):
         """Test input placeholder text"""
-        widget = ChampionViewerWidget(0, champion_data)
+        widget = viewer_ro
         assert "Champion name" in widget.champion_input.placeholderText()
 
-    def test_widget_display_name(self, qapp, champion_data):
+    def test_widget_display_name(self):
         """Test widget display name"""
-        widget = ChampionViewerWidget(0, champion_data)
+        # Pure helper: skip Qt widget construction and set only what it reads
+        widget = ChampionViewerWidget.__new__(ChampionViewerWidget)
+        widget.current_champion = ""
+        widget.current_page_type = ""
+        widget.current_opponent_champion = ""
+        widget.is_picked = False
         assert widget.get_display_name() == "(Empty)"
         widget.current_champion = "ashe"
         # When a champion is set, prefer the champion name over internal viewer numbering.
@@ -104,7 +77,7 @@ class TestChampionData:
         """Test searching by English name"""
         results = champion_data.search("ashe")
         assert len(results) > 0
-        assert any(r['id'] == 'ashe' for r in results)
+        assert 'ashe' in {r['id'] for r in results}
 
     def test_search_japanese_name(self, champion_data):
         """Test searching by Japanese name"""
@@ -125,6 +98,32 @@ class TestChampionData:
         # Both should find the same champion
         assert len(results_lower) == len(results_upper)
 
+    def test_search_results_cached(self, monkeypatch):
+        """Test repeated (and evicted) queries give the same results, unaffected by caller edits"""
+        from champion_data import ChampionData
+        data = ChampionData()
+        monkeypatch.setattr(ChampionData, 'SEARCH_CACHE_SIZE', 2)
+        expected = data.search("Ashe")
+        assert expected != []
+
+        first = data.search("ashe")
+        first[0]['english_name'] = 'Changed'
+        first.clear()
+        assert data.search("ASHE") == expected
+        # Push "ashe" out of the bounded cache and look it up again
+        for query in ("lux", "zed", "jinx"):
+            data.search(query)
+        assert data.search("ashe") == expected
+
+    def test_search_incremental_matches_full_scan(self):
+        """Test typing, extending and backspacing a query gives the same hits as a fresh scan"""
+        from champion_data import ChampionData
+        typed = ChampionData()
+        queries = ("k", "ka", "kat", "ka", "kar", "a", "ah", "ahr", "アッ", "アッシ", "zzz", "zzzz")
+        for query in queries:
+            assert typed.search(query) == ChampionData().search(query), query
+        assert typed.search("kat") != []
+
     def test_get_champion_by_id(self, champion_data):
         """Test getting champion by ID"""
         champ = champion_data.get_champion("ashe")
@@ -150,21 +149,37 @@ class TestChampionData:
 class TestMainWindow:
     """Tests for MainWindow class"""
 
-    def test_main_window_initialization(self, qapp):
+    def test_main_window_initialization(self, main_window_ro):
         """Test main window can be initialized"""
-        window = MainWindow()
+        window = main_window_ro
         assert window is not None
         assert window.windowTitle() == "LoL Viewer"
         assert window.champion_data is not None
 
-    def test_main_window_has_initial_viewers(self, qapp):
+    def test_webengine_not_loaded(self, main_window_ro):
+        """Test headless windows use NullWebView without importing QtWebEngine"""
+        assert isinstance(main_window_ro.live_game_web_view, NullWebView)
+        # Fresh interpreter: earlier tests in this process may have loaded it
+        code = (
+            "import sys; from PyQt6.QtWidgets import QApplication; app = QApplication([]); "
+            "import lcu_detector; lcu_detector.ChampionDetector._load_champion_map = lambda self: None; "
+            "import main_window; main_window.MainWindow(); "
+            "assert 'PyQt6.QtWebEngineWidgets' not in sys.modules"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True,
+        )
+
+    def test_main_window_has_initial_viewers(self, main_window_ro):
         """Test main window has no viewers by default"""
-        window = MainWindow()
+        window = main_window_ro
         assert len(window.viewers) == 0
 
-    def test_main_window_size(self, qapp):
+    def test_main_window_size(self, main_window_ro):
         """Test main window has correct initial size"""
-        window = MainWindow()
+        window = main_window_ro
         assert window.width() == 1600
         assert window.height() == 900
 
@@ -214,12 +229,28 @@ class TestMainWindow:
         while len(window.viewers) < MainWindow.MAX_VIEWERS:
             window.add_viewer()
         assert len(window.viewers) == MainWindow.MAX_VIEWERS
+        assert window.viewers_list.count() == MainWindow.MAX_VIEWERS
 
         # Try to add one more (should be rejected)
         initial_count = len(window.viewers)
         window.add_viewer()
         assert len(window.viewers) == initial_count
 
+    def test_latest_version_check_runs_off_gui_thread(self, qapp, qtbot):
+        """Test the background version check reports back through its signal"""
+        import threading
+        from unittest.mock import patch
+
+        window = MainWindow()
+        window._latest_version_check_inflight = True
+        with patch('updater.Updater.check_for_updates', return_value=(True, {'tag_name': 'v9.9.9'})):
+            with qtbot.waitSignal(window._latest_version_checked, timeout=5000):
+                threading.Thread(target=window._run_latest_version_check).start()
+
+        assert window.latest_version_label.text() == "Latest version: 9.9.9"
+        assert window._latest_version_check_inflight is False
+        assert window._latest_version_check_done is True
+
 
 class TestOpponentChampionInput:
     """Regression tests for opponent champion input (standard feature)."""
@@ -10,19 +10,20 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Headless-friendly defaults for CI environments (no display server).
-os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
-os.environ.setdefault("QT_OPENGL", "software")
-os.environ.setdefault("QTWEBENGINE_DISABLE_SANDBOX", "1")
-os.environ.setdefault("QTWEBENGINE_CHROMIUM_FLAGS", "--no-sandbox --disable-gpu")
-os.environ.setdefault("LOL_VIEWER_DISABLE_WEBENGINE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_LCU_SERVICE", "1")
-os.environ.setdefault("LOL_VIEWER_DISABLE_DIALOGS", "1")
+import pytest
 
 from widgets import ChampionViewerWidget
 from constants import DEFAULT_MATCHUP_URL
 from main_window import MainWindow
 
+# Default-template matchup URL for Ahri vs Zed in mid, built once at import
+EXPECTED_DEFAULT_MATCHUP_URL = (
+    DEFAULT_MATCHUP_URL
+    .replace("{champion_name1}", "ahri")
+    .replace("{champion_name2}", "zed")
+    .replace("{lane_name}", "middle")
+)
+
 
 def test_matchup_url_uses_default_template():
     """Matchup URLs should fall back to the default template."""
@@ -30,14 +31,8 @@ def test_matchup_url_uses_default_template():
     widget.main_window = None
 
     url = ChampionViewerWidget.get_matchup_url(widget, "Ahri", "Zed", "middle")
-    expected = (
-        DEFAULT_MATCHUP_URL
-        .replace("{champion_name1}", "ahri")
-        .replace("{champion_name2}", "zed")
-        .replace("{lane_name}", "middle")
-    )
 
-    assert url == expected
+    assert url == EXPECTED_DEFAULT_MATCHUP_URL
 
 
 def test_matchup_url_uses_custom_template():
@@ -79,24 +74,27 @@ def test_get_open_champion_suggestions_deduplicates_and_excludes_self():
 # ---------------------------------------------------------------------------
 
 
-def _make_window():
-    """Create a minimal MainWindow stub with matchup list state initialised."""
+_EMPTY_MATCHUP = (("", ""),) * 5
+
+
+@pytest.fixture
+def matchup_window():
+    """Minimal MainWindow stub with matchup list state initialised."""
     window = MainWindow.__new__(MainWindow)
-    window._matchup_data = [("", "")] * 5
+    window._matchup_data = list(_EMPTY_MATCHUP)
     window.pending_enemy_picks = []
+    window._matchup_last_applied = None
     # Stub out UI refresh (no real widgets)
     window._matchup_rows = []
     window.update_matchup_list = lambda: None
     return window
 
 
-def _make_window_with_champion_data():
-    """Create a MainWindow stub with champion data for lane aptitude testing."""
-    from champion_data import ChampionData
-
-    window = _make_window()
-    window.champion_data = ChampionData()
-    return window
+@pytest.fixture
+def matchup_window_with_champion_data(matchup_window, champion_data):
+    """MainWindow stub with (session-shared) champion data for lane aptitude testing."""
+    matchup_window.champion_data = champion_data
+    return matchup_window
 
 
 def _emit(window, allies=None, enemies=None, phase="ChampSelect", is_new_session=False):
@@ -115,18 +113,18 @@ def _emit(window, allies=None, enemies=None, phase="ChampSelect", is_new_session
 # ---------------------------------------------------------------------------
 
 
-def test_ally_placed_by_lane():
+def test_ally_placed_by_lane(matchup_window):
     """Allies with lane info should be placed in the corresponding row."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle"), ("Garen", "top")])
 
     assert window._matchup_data[0] == ("Garen", "")  # top → row 0
     assert window._matchup_data[2] == ("Ahri", "")    # middle → row 2
 
 
-def test_ally_placed_in_order_without_lane():
+def test_ally_placed_in_order_without_lane(matchup_window):
     """Allies without lane info should be placed in first empty slot."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", ""), ("Lux", ""), ("Garen", "")])
 
     assert window._matchup_data[0] == ("Ahri", "")
@@ -134,9 +132,9 @@ def test_ally_placed_in_order_without_lane():
     assert window._matchup_data[2] == ("Garen", "")
 
 
-def test_ally_mixed_lane_and_no_lane():
+def test_ally_mixed_lane_and_no_lane(matchup_window):
     """Allies with and without lane info should coexist correctly."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle"), ("Lux", ""), ("Garen", "top")])
 
     assert window._matchup_data[0] == ("Garen", "")   # top → row 0
@@ -144,9 +142,9 @@ def test_ally_mixed_lane_and_no_lane():
     assert window._matchup_data[2] == ("Ahri", "")     # middle → row 2
 
 
-def test_ally_not_duplicated_on_repeated_emit():
+def test_ally_not_duplicated_on_repeated_emit(matchup_window):
     """Same ally data emitted multiple times should not create duplicates."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle")])
     _emit(window, allies=[("Ahri", "middle")])
     _emit(window, allies=[("Ahri", "middle")])
@@ -157,11 +155,28 @@ def test_ally_not_duplicated_on_repeated_emit():
     assert window._matchup_data[2] == ("Ahri", "")
 
 
-def test_ally_lane_occupied_falls_back_to_first_empty():
+def test_repeated_emit_skips_refresh_until_rows_change(matchup_window):
+    """Identical payloads onto unchanged rows should skip the UI refresh."""
+    window = matchup_window
+    refreshes = []
+    window.update_matchup_list = lambda: refreshes.append(1)
+
+    _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
+    _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
+    assert len(refreshes) == 1
+
+    # Rows changed underneath (e.g. user cleared) → same payload re-applies
+    window._matchup_data = list(_EMPTY_MATCHUP)
+    _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
+    assert len(refreshes) == 2
+    assert window._matchup_data[2][0] == "Ahri"
+
+
+def test_ally_lane_occupied_falls_back_to_first_empty(matchup_window):
     """If lane row is already occupied, ally goes to first empty slot."""
-    window = _make_window()
+    window = matchup_window
     # Manually place someone in middle (row 2)
-    window._matchup_data[2] = ("Yasuo", "")
+    window._ally_names[2] = "Yasuo"
 
     _emit(window, allies=[("Ahri", "middle")])
 
@@ -170,9 +185,9 @@ def test_ally_lane_occupied_falls_back_to_first_empty():
     assert window._matchup_data[0] == ("Ahri", "")
 
 
-def test_blind_pick_ally_placed_by_lane_aptitude():
+def test_blind_pick_ally_placed_by_lane_aptitude(matchup_window_with_champion_data):
     """Blind pick allies (no lane info) should be placed by lane aptitude from champions.json."""
-    window = _make_window_with_champion_data()
+    window = matchup_window_with_champion_data
     # Aatrox top:5, Ahri mid:5 — both sent without lane info (blind pick)
     _emit(window, allies=[("Aatrox", ""), ("Ahri", "")])
 
@@ -185,9 +200,9 @@ def test_blind_pick_ally_placed_by_lane_aptitude():
 # ---------------------------------------------------------------------------
 
 
-def test_enemy_placed_by_lane_aptitude():
+def test_enemy_placed_by_lane_aptitude(matchup_window_with_champion_data):
     """Enemies should be placed by lane aptitude from champions.json."""
-    window = _make_window_with_champion_data()
+    window = matchup_window_with_champion_data
     # Aatrox (top:5), Thresh (sup:5), Yasuo (mid:5)
     _emit(window, enemies=["Yasuo", "Thresh", "Aatrox"])
 
@@ -196,20 +211,20 @@ def test_enemy_placed_by_lane_aptitude():
     assert window._matchup_data[4] == ("", "Thresh")  # sup
 
 
-def test_enemy_fallback_without_champion_data():
+def test_enemy_fallback_without_champion_data(matchup_window):
     """Enemies should use first empty slot when champion_data unavailable."""
-    window = _make_window()  # No champion_data
+    window = matchup_window  # No champion_data
     _emit(window, enemies=["Zed", "Yasuo"])
 
     assert window._matchup_data[0] == ("", "Zed")
     assert window._matchup_data[1] == ("", "Yasuo")
 
 
-def test_enemy_lane_occupied_uses_next_empty():
+def test_enemy_lane_occupied_uses_next_empty(matchup_window_with_champion_data):
     """When best lane is occupied, enemy goes to next available empty slot."""
-    window = _make_window_with_champion_data()
+    window = matchup_window_with_champion_data
     # Pre-occupy support row
-    window._matchup_data[4] = ("", "Leona")
+    window._enemy_names[4] = "Leona"
 
     # Thresh has sup:5 but row 4 is occupied
     _emit(window, enemies=["Thresh"])
@@ -219,9 +234,9 @@ def test_enemy_lane_occupied_uses_next_empty():
     assert window._matchup_data[4] == ("", "Leona")  # Leona stays
 
 
-def test_enemy_not_duplicated_on_repeated_emit():
+def test_enemy_not_duplicated_on_repeated_emit(matchup_window):
     """Same enemy data emitted multiple times should not create duplicates."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, enemies=["Zed"])
     _emit(window, enemies=["Zed"])
 
@@ -229,9 +244,9 @@ def test_enemy_not_duplicated_on_repeated_emit():
     assert enemy_names.count("Zed") == 1
 
 
-def test_enemy_fills_empty_slots_incrementally():
+def test_enemy_fills_empty_slots_incrementally(matchup_window):
     """New enemies should fill next empty slot without affecting existing ones."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, enemies=["Zed"])
     _emit(window, enemies=["Zed", "Yasuo"])
     _emit(window, enemies=["Zed", "Yasuo", "Lux"])
@@ -246,9 +261,9 @@ def test_enemy_fills_empty_slots_incrementally():
 # ---------------------------------------------------------------------------
 
 
-def test_ally_and_enemy_placed_together():
+def test_ally_and_enemy_placed_together(matchup_window):
     """Allies and enemies should be placed independently in the same rows."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle"), ("Garen", "top")], enemies=["Zed", "Yasuo"])
 
     # Allies placed by lane
@@ -265,9 +280,9 @@ def test_ally_and_enemy_placed_together():
 # ---------------------------------------------------------------------------
 
 
-def test_new_session_clears_data():
+def test_new_session_clears_data(matchup_window):
     """New ChampSelect session should auto-clear all rows before applying new data."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
 
     # New session with different data
@@ -282,9 +297,9 @@ def test_new_session_clears_data():
     assert window._matchup_data[0] == ("Lux", "Yasuo")
 
 
-def test_new_session_without_data_clears_all():
+def test_new_session_without_data_clears_all(matchup_window):
     """New session with empty data should just clear everything."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
 
     _emit(window, allies=[], enemies=[], is_new_session=True)
@@ -297,9 +312,9 @@ def test_new_session_without_data_clears_all():
 # ---------------------------------------------------------------------------
 
 
-def test_empty_signal_does_not_clear():
+def test_empty_signal_does_not_clear(matchup_window):
     """An emission with empty allies/enemies should NOT clear existing data."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
 
     # Empty signal (e.g., detector polling with no new data)
@@ -310,9 +325,9 @@ def test_empty_signal_does_not_clear():
     assert window._matchup_data[0][1] == "Zed"
 
 
-def test_partial_signal_preserves_existing():
+def test_partial_signal_preserves_existing(matchup_window):
     """A signal with only some champions should not affect others."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle"), ("Garen", "top")], enemies=["Zed"])
 
     # Signal with only Ahri (Garen not mentioned)
@@ -329,9 +344,9 @@ def test_partial_signal_preserves_existing():
 # ---------------------------------------------------------------------------
 
 
-def test_refresh_clears_all():
+def test_refresh_clears_all(matchup_window):
     """Refresh should clear all matchup data."""
-    window = _make_window()
+    window = matchup_window
     window.champion_detector = None  # No detector available in test
     _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
 
@@ -346,9 +361,9 @@ def test_refresh_clears_all():
 # ---------------------------------------------------------------------------
 
 
-def test_blind_pick_fill_empty_rows():
+def test_blind_pick_fill_empty_rows(matchup_window):
     """InProgress phase with empty rows should fill them incrementally."""
-    window = _make_window()
+    window = matchup_window
 
     # Game starts — all 5 allies and 5 enemies arrive at once
     _emit(
@@ -364,9 +379,9 @@ def test_blind_pick_fill_empty_rows():
         assert window._matchup_data[i][1] != ""
 
 
-def test_blind_pick_partial_fill_preserves_existing():
+def test_blind_pick_partial_fill_preserves_existing(matchup_window):
     """InProgress fill should only place in empty slots, not overwrite."""
-    window = _make_window()
+    window = matchup_window
 
     # Pre-existing data (e.g., allies from champ select)
     _emit(window, allies=[("Ahri", ""), ("Lux", "")])
@@ -390,9 +405,9 @@ def test_blind_pick_partial_fill_preserves_existing():
     assert window._matchup_data[2][1] == "Fizz"
 
 
-def test_swap_enemies():
+def test_swap_enemies(matchup_window):
     """Swapping enemies should work correctly."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", ""), ("Lux", "")], enemies=["Zed", "Yasuo"])
 
     window._matchup_swap_enemies(0)
@@ -401,9 +416,9 @@ def test_swap_enemies():
     assert window._matchup_data[1] == ("Lux", "Zed")
 
 
-def test_clear_matchup_list():
+def test_clear_matchup_list(matchup_window):
     """Clearing the matchup list should reset all entries."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "middle")], enemies=["Zed"])
 
     window.clear_matchup_list()
@@ -416,9 +431,9 @@ def test_clear_matchup_list():
 # ---------------------------------------------------------------------------
 
 
-def test_dnd_drop_ally_swaps_only_allies():
+def test_dnd_drop_ally_swaps_only_allies(matchup_window):
     """DnD drop should swap only ally champions between rows."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", ""), ("Lux", ""), ("Garen", "")], enemies=["Zed", "Yasuo", "Fizz"])
 
     window._matchup_dnd_drop(source_index=0, target_index=2, side="ally")
@@ -429,9 +444,9 @@ def test_dnd_drop_ally_swaps_only_allies():
     assert window._matchup_data[1] == ("Lux", "Yasuo")
 
 
-def test_dnd_drop_enemy_swaps_only_enemies():
+def test_dnd_drop_enemy_swaps_only_enemies(matchup_window):
     """DnD drop should swap only enemy champions between rows."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", ""), ("Lux", ""), ("Garen", "")], enemies=["Zed", "Yasuo", "Fizz"])
 
     window._matchup_dnd_drop(source_index=0, target_index=2, side="enemy")
@@ -442,9 +457,9 @@ def test_dnd_drop_enemy_swaps_only_enemies():
     assert window._matchup_data[1] == ("Lux", "Yasuo")
 
 
-def test_dnd_drop_same_row_noop():
+def test_dnd_drop_same_row_noop(matchup_window):
     """Dropping on the same row should be a no-op."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "")], enemies=["Zed"])
 
     original = list(window._matchup_data)
@@ -453,9 +468,9 @@ def test_dnd_drop_same_row_noop():
     assert window._matchup_data == original
 
 
-def test_dnd_drop_out_of_bounds_noop():
+def test_dnd_drop_out_of_bounds_noop(matchup_window):
     """Dropping with out-of-bounds indices should be a no-op."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", "")], enemies=["Zed"])
 
     original = list(window._matchup_data)
@@ -467,9 +482,9 @@ def test_dnd_drop_out_of_bounds_noop():
 
 
 
-def test_dnd_nonadjacent_swap():
+def test_dnd_nonadjacent_swap(matchup_window):
     """DnD should support non-adjacent row swaps."""
-    window = _make_window()
+    window = matchup_window
     _emit(
         window,
         allies=[("Ahri", ""), ("Lux", ""), ("Garen", ""), ("Jinx", ""), ("Thresh", "")],
@@ -484,9 +499,9 @@ def test_dnd_nonadjacent_swap():
     assert window._matchup_data[4][1] == "Leona"
 
 
-def test_dnd_unknown_side_noop():
+def test_dnd_unknown_side_noop(matchup_window):
     """An unknown side value should be a no-op."""
-    window = _make_window()
+    window = matchup_window
     _emit(window, allies=[("Ahri", ""), ("Lux", "")], enemies=["Zed", "Yasuo"])
 
     original = list(window._matchup_data)
@@ -500,9 +515,9 @@ def test_dnd_unknown_side_noop():
 # ---------------------------------------------------------------------------
 
 
-def test_debug_add_ally():
+def test_debug_add_ally(matchup_window):
     """Debug add should place ally in first empty slot."""
-    window = _make_window()
+    window = matchup_window
     window._debug_champion_input = type("FakeInput", (), {"text": lambda self: "Ahri", "clear": lambda self: None, "strip": lambda self: "Ahri"})()
     window._debug_status_label = type("FakeLabel", (), {"setText": lambda self, t: None})()
 
@@ -511,9 +526,9 @@ def test_debug_add_ally():
     assert window._matchup_data[0] == ("Ahri", "")
 
 
-def test_debug_add_enemy():
+def test_debug_add_enemy(matchup_window):
     """Debug add should place enemy in first empty slot."""
-    window = _make_window()
+    window = matchup_window
     window._debug_champion_input = type("FakeInput", (), {"text": lambda self: "Zed", "clear": lambda self: None})()
     window._debug_status_label = type("FakeLabel", (), {"setText": lambda self, t: None})()
 
@@ -522,9 +537,9 @@ def test_debug_add_enemy():
     assert window._matchup_data[0] == ("", "Zed")
 
 
-def test_debug_add_no_empty_slot():
+def test_debug_add_no_empty_slot(matchup_window):
     """Debug add should be a no-op when no empty slot is available."""
-    window = _make_window()
+    window = matchup_window
     _emit(
         window,
         allies=[("Ahri", ""), ("Lux", ""), ("Garen", ""), ("Jinx", ""), ("Thresh", "")],
@@ -539,9 +554,9 @@ def test_debug_add_no_empty_slot():
     assert "Ashe" not in allies
 
 
-def test_debug_add_then_refresh_clears():
+def test_debug_add_then_refresh_clears(matchup_window):
     """Debug-added champions should be cleared by the refresh button."""
-    window = _make_window()
+    window = matchup_window
     window._debug_champion_input = type("FakeInput", (), {"text": lambda self: "Ahri", "clear": lambda self: None})()
     window._debug_status_label = type("FakeLabel", (), {"setText": lambda self, t: None})()
 
@@ -1,17 +1,51 @@
 #!/usr/bin/env python3
 """
-Standalone script to test the update checker without building exe
+Update check smoke test, plus a standalone script that queries the live
+GitHub API without building the exe (python tests/test_update_check.py)
 """
+import json
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from packaging import version
+from unittest.mock import Mock, patch
 
+RELEASE_PAYLOAD = {
+    "tag_name": "v9.9.9",
+    "name": "v9.9.9",
+    "published_at": "2024-01-01T00:00:00Z",
+    "body": "Release notes",
+    "assets": [
+        {
+            "name": "lol-viewer.exe",
+            "browser_download_url": "https://example.invalid/lol-viewer.exe",
+        }
+    ],
+}
 
-def test_update_check():
-    """Test update check functionality"""
+
+def test_update_check(tmp_path, monkeypatch):
+    """Test update check and download URL against a canned GitHub response"""
+    from updater import Updater
+
+    monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+    updater = Updater("0.1.0", parent_widget=None)
+    mock_response = Mock(status_code=200, headers={})
+    mock_response.iter_content.return_value = iter([json.dumps(RELEASE_PAYLOAD).encode()])
+
+    with patch('requests.Session.get', return_value=mock_response) as mock_get:
+        has_update, release_info = updater.check_for_updates()
+
+    mock_get.assert_called_once()
+    assert has_update is True
+    assert release_info == RELEASE_PAYLOAD
+    with patch('sys.argv', ['lol-viewer.exe']):
+        assert updater.get_download_url(release_info) == "https://example.invalid/lol-viewer.exe"
+
+
+def check_live():
+    """Check for updates against the real GitHub API and print the result"""
 
     # Test version (set to older version to trigger update)
     current_version = "0.1.0"
@@ -83,4 +117,4 @@ def test_update_check():
 
 
 if __name__ == "__main__":
-    test_update_check()
+    check_live()
@@ -1,7 +1,9 @@
 """
 Tests for the updater module
 """
+import json
 import os
+import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,6 +13,24 @@ from unittest.mock import Mock, patch, MagicMock
 from updater import Updater
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the release cache of each test in its own directory"""
+    monkeypatch.setenv('LOL_VIEWER_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _release_response(status_code=200, payload=None, headers=None):
+    """Mock GitHub releases response with real status and headers"""
+    response = Mock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.headers = headers or {}
+    body = json.dumps(payload).encode() if payload is not None else b''
+    response.iter_content.side_effect = lambda chunk_size=1: iter([body[:chunk_size], body[chunk_size:]])
+    return response
+
+
 class TestUpdater:
     """Test cases for the Updater class"""
 
@@ -18,13 +38,12 @@ class TestUpdater:
         """Test that newer version is detected"""
         updater = Updater("1.0.0")
 
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = _release_response(payload={
             'tag_name': 'v1.1.0',
             'body': 'New features added'
-        }
+        })
 
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             has_update, release_info = updater.check_for_updates()
 
         assert has_update is True
@@ -35,13 +54,12 @@ class TestUpdater:
         """Test that same version is not treated as update"""
         updater = Updater("1.0.0")
 
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = _release_response(payload={
             'tag_name': 'v1.0.0',
             'body': 'Current version'
-        }
+        })
 
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             has_update, release_info = updater.check_for_updates()
 
         assert has_update is False
@@ -53,13 +71,12 @@ class TestUpdater:
         """Test that older remote version is not treated as update"""
         updater = Updater("2.0.0")
 
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response = _release_response(payload={
             'tag_name': 'v1.5.0',
             'body': 'Older version'
-        }
+        })
 
-        with patch('requests.get', return_value=mock_response):
+        with patch('requests.Session.get', return_value=mock_response):
             has_update, release_info = updater.check_for_updates()
 
         assert has_update is False
@@ -71,12 +88,131 @@ class TestUpdater:
         """Test that network errors are handled gracefully"""
         updater = Updater("1.0.0")
 
-        with patch('requests.get', side_effect=Exception("Network error")):
+        with patch('requests.Session.get', side_effect=Exception("Network error")):
             has_update, release_info = updater.check_for_updates()
 
         assert has_update is False
         assert release_info is None
 
+    def test_oversized_release_response_rejected(self):
+        """Test that an implausibly large release body is not decoded"""
+        updater = Updater("1.0.0")
+        response = _release_response(
+            payload={'tag_name': 'v1.1.0'},
+            headers={'Content-Length': str(Updater.MAX_RELEASE_BYTES + 1)},
+        )
+
+        with patch('requests.Session.get', return_value=response):
+            has_update, release_info = updater.check_for_updates()
+
+        assert has_update is False
+        assert release_info is None
+        # Refused from the header alone, without reading the body
+        response.iter_content.assert_not_called()
+
+    def test_oversized_release_body_without_length_rejected(self):
+        """Test that a body without Content-Length stops being read past MAX_RELEASE_BYTES"""
+        updater = Updater("1.0.0")
+        response = _release_response()
+        reads = []
+
+        def endless(chunk_size=1):
+            while True:
+                reads.append(chunk_size)
+                yield b' ' * chunk_size
+
+        response.iter_content.side_effect = endless
+
+        with patch('requests.Session.get', return_value=response):
+            assert updater.check_for_updates() == (False, None)
+
+        assert sum(reads) <= Updater.MAX_RELEASE_BYTES + 64 * 1024
+        response.close.assert_called_once()
+
+    def test_conditional_request_reuses_cached_release(self):
+        """Test that a 304 answer is served from the cached release"""
+        updater = Updater("1.0.0")
+        first = _release_response(
+            payload={'tag_name': 'v1.1.0', 'body': 'New features added'},
+            headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'},
+        )
+        with patch('requests.Session.get', return_value=first):
+            updater.check_for_updates()
+
+        not_modified = _release_response(status_code=304)
+        with patch('requests.Session.get', return_value=not_modified) as mock_get:
+            has_update, release_info = updater.check_for_updates(use_cache=False)
+
+        headers = mock_get.call_args.kwargs['headers']
+        assert headers['If-None-Match'] == '"abc"'
+        assert headers['If-Modified-Since'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+        assert has_update is True
+        assert release_info['tag_name'] == 'v1.1.0'
+
+    def test_release_payload_trimmed(self):
+        """Test that only the fields the updater uses are kept"""
+        updater = Updater("1.0.0")
+        response = _release_response(payload={
+            'tag_name': 'v1.1.0',
+            'body': 'New features added',
+            'author': {'login': 'someone'},
+            'assets': [{'name': 'lol-viewer.exe', 'browser_download_url': 'http://example.com/a.exe',
+                        'uploader': {'login': 'someone'}, 'size': 1}],
+        })
+        with patch('requests.Session.get', return_value=response) as mock_get:
+            _, release_info = updater.check_for_updates()
+
+        assert mock_get.call_args.kwargs['headers']['Accept'] == 'application/vnd.github+json'
+        assert release_info == {
+            'tag_name': 'v1.1.0',
+            'body': 'New features added',
+            'assets': [{'name': 'lol-viewer.exe', 'browser_download_url': 'http://example.com/a.exe'}],
+        }
+
+    def test_recent_check_skips_request(self, isolated_cache):
+        """Test that a release cached within the TTL is used without a request"""
+        updater = Updater("1.0.0")
+        response = _release_response(payload={'tag_name': 'v1.1.0'})
+        with patch('requests.Session.get', return_value=response):
+            updater.check_for_updates()
+
+        with patch('requests.Session.get') as mock_get:
+            has_update, release_info = updater.check_for_updates()
+        mock_get.assert_not_called()
+        assert has_update is True
+        assert release_info['tag_name'] == 'v1.1.0'
+
+        # Past the TTL the release is revalidated
+        cache_file = isolated_cache / Updater.RELEASE_CACHE_FILE
+        stale = cache_file.stat().st_mtime - Updater.RELEASE_CACHE_TTL - 1
+        os.utime(cache_file, (stale, stale))
+        with patch('requests.Session.get', return_value=response) as mock_get:
+            updater.check_for_updates()
+        mock_get.assert_called_once()
+
+    def test_import_defers_heavy_modules(self):
+        """Test that importing updater does not pull in Qt, requests or packaging"""
+        code = (
+            "import sys, updater; "
+            "print(sorted(m for m in ('PyQt6', 'requests', 'packaging') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_session_reused_with_retries(self):
+        """Test that release check and download share one retrying session"""
+        updater = Updater("1.0.0")
+        session = updater._get_session()
+
+        assert updater._get_session() is session
+        assert session.get_adapter('https://api.github.com').max_retries.total == 3
+        assert session.headers['User-Agent'] == 'lol-viewer-updater/1.0.0'
+        assert 'gzip' in session.headers['Accept-Encoding']
+
     def test_get_download_url_regular_version(self):
         """Test download URL extraction for regular version"""
         updater = Updater("1.0.0")
@@ -109,6 +245,22 @@ class TestUpdater:
 
         assert url == 'http://example.com/debug.exe'
 
+    def test_get_download_url_falls_back_to_other_variant(self):
+        """Test that the other exe variant is used when the preferred one is missing"""
+        updater = Updater("1.0.0")
+
+        release_info = {
+            'assets': [
+                {'name': 'notes.txt', 'browser_download_url': 'http://example.com/notes.txt'},
+                {'name': 'lol-viewer.exe', 'browser_download_url': 'http://example.com/lol-viewer.exe'},
+            ]
+        }
+
+        with patch('sys.argv', ['lol-viewer-debug.exe']):
+            url = updater.get_download_url(release_info)
+
+        assert url == 'http://example.com/lol-viewer.exe'
+
     def test_get_download_url_not_found(self):
         """Test when download URL is not found"""
         updater = Updater("1.0.0")
@@ -120,6 +272,398 @@ class TestUpdater:
         url = updater.get_download_url(release_info)
         assert url is None
 
+    def test_download_update_writes_all_chunks(self):
+        """Test that the downloaded body lands in the temp file unchanged"""
+        updater = Updater("1.0.0")
+        chunks = [b'a' * 300_000, b'b' * 5, b'c' * 70_000]
+        response = Mock()
+        response.headers = {'content-length': str(sum(map(len, chunks)))}
+        response.iter_content.return_value = iter(chunks)
+
+        with patch('requests.Session.head', return_value=_release_response()), \
+                patch('requests.Session.get', return_value=response), \
+                patch('PyQt6.QtWidgets.QProgressDialog') as mock_dialog:
+            path = updater.download_update('http://example.com/setup.zip')
+
+        try:
+            assert path.endswith('.zip')
+            with open(path, 'rb') as f:
+                assert f.read() == b''.join(chunks)
+            # Progress is sampled; each shown percentage appears once, ending at 100%
+            values = [c.args[0] for c in mock_dialog.return_value.setValue.call_args_list]
+            assert values[-1] == 100
+            assert len(values) == len(set(values))
+        finally:
+            os.unlink(path)
+
+    def test_download_update_checksum(self, isolated_cache):
+        """Test that the streamed SHA-256 is checked against the published digest"""
+        import hashlib
+        updater = Updater("1.0.0")
+        body = b'installer bytes'
+        url = 'http://example.com/lol-viewer.exe'
+        release_info = {'assets': [{'name': 'lol-viewer.exe', 'browser_download_url': url,
+                                    'digest': 'sha256:' + hashlib.sha256(body).hexdigest()}]}
+        expected = updater.get_expected_sha256(release_info, url)
+        assert expected == hashlib.sha256(body).hexdigest()
+        assert updater.get_expected_sha256(release_info, updater.NIGHTLY_LINK_URL) is None
+
+        def download(sha):
+            response = Mock()
+            response.headers = {}
+            response.iter_content.return_value = iter([body])
+            with patch('requests.Session.head', return_value=_release_response()), \
+                    patch('requests.Session.get', return_value=response), \
+                    patch('PyQt6.QtWidgets.QProgressDialog'), \
+                    patch('PyQt6.QtWidgets.QMessageBox'):
+                return updater.download_update(url, sha)
+
+        path = download(expected)
+        assert path is not None
+        os.unlink(path)
+
+        assert download('0' * 64) is None
+        # No partial download left behind (only the installer cache entry)
+        assert [p.name for p in isolated_cache.iterdir()] == [Updater.INSTALLER_CACHE_FILE]
+
+    def test_download_update_failure_removes_temp_file(self, isolated_cache):
+        """Test that a broken download leaves no partial file behind"""
+        updater = Updater("1.0.0")
+
+        def broken_stream(chunk_size):
+            yield b'partial'
+            raise IOError("connection reset")
+
+        response = Mock()
+        response.headers = {}
+        response.iter_content.side_effect = broken_stream
+
+        with patch('requests.Session.head', return_value=_release_response()), \
+                patch('requests.Session.get', return_value=response), \
+                patch('PyQt6.QtWidgets.QProgressDialog'), \
+                patch('PyQt6.QtWidgets.QMessageBox') as mock_box:
+            assert updater.download_update('http://example.com/setup.zip') is None
+
+        mock_box.critical.assert_called_once()
+        assert list(isolated_cache.iterdir()) == []
+
+    def test_download_update_rejects_error_page(self, isolated_cache):
+        """Test that an HTML page behind the download link fails before the transfer"""
+        updater = Updater("1.0.0")
+        head = _release_response(headers={'Content-Type': 'text/html; charset=utf-8'})
+
+        with patch('requests.Session.head', return_value=head), \
+                patch('requests.Session.get') as mock_get, \
+                patch('PyQt6.QtWidgets.QProgressDialog'), \
+                patch('PyQt6.QtWidgets.QMessageBox') as mock_box:
+            assert updater.download_update('http://example.com/setup.zip') is None
+
+        mock_get.assert_not_called()
+        assert 'text/html' in mock_box.critical.call_args.args[2]
+        assert list(isolated_cache.iterdir()) == []
+
+    def test_download_update_ignores_failed_head(self):
+        """Test that a host refusing HEAD (with an HTML error body) still gets a plain download"""
+        updater = Updater("1.0.0")
+        body = b'zip bytes'
+        head = _release_response(status_code=405, headers={
+            'Content-Type': 'text/html', 'Content-Length': '512', 'Accept-Ranges': 'bytes', 'ETag': '"err"',
+        })
+        response = Mock()
+        response.headers = {'content-type': 'application/zip', 'content-length': str(len(body))}
+        response.iter_content.return_value = iter([body])
+
+        with patch('requests.Session.head', return_value=head):
+            assert updater._probe_download('http://example.com/setup.zip') == {
+                "size": 0, "ranges": False, "etag": None, "type": ""}
+
+        with patch.object(Updater, 'RANGE_MIN_SIZE', 1), \
+                patch('requests.Session.head', return_value=head), \
+                patch('requests.Session.get', return_value=response) as mock_get, \
+                patch('PyQt6.QtWidgets.QProgressDialog'):
+            path = updater.download_update('http://example.com/setup.zip')
+
+        try:
+            assert 'Range' not in (mock_get.call_args.kwargs.get('headers') or {})
+            with open(path, 'rb') as f:
+                assert f.read() == body
+        finally:
+            os.unlink(path)
+
+    def test_download_update_rejects_html_body(self, isolated_cache):
+        """Test that an HTML page served by the GET itself is not kept as the installer"""
+        updater = Updater("1.0.0")
+        response = Mock()
+        response.headers = {'content-type': 'text/html; charset=utf-8'}
+        response.iter_content.return_value = iter([b'<html>'])
+
+        with patch('requests.Session.head', side_effect=OSError("no HEAD")), \
+                patch('requests.Session.get', return_value=response), \
+                patch('PyQt6.QtWidgets.QProgressDialog'), \
+                patch('PyQt6.QtWidgets.QMessageBox') as mock_box:
+            assert updater.download_update('http://example.com/setup.zip') is None
+
+        assert 'text/html' in mock_box.critical.call_args.args[2]
+        assert list(isolated_cache.iterdir()) == []
+
+    def test_download_update_reuses_cached_installer(self):
+        """Test that an unchanged installer (same ETag and size) is not downloaded again"""
+        updater = Updater("1.0.0")
+        body = b'zip bytes'
+
+        def download(etag):
+            head = _release_response(headers={'ETag': etag, 'Content-Length': str(len(body))})
+            response = Mock()
+            response.headers = {'content-length': str(len(body))}
+            response.iter_content.return_value = iter([body])
+            with patch('requests.Session.head', return_value=head), \
+                    patch('requests.Session.get', return_value=response) as mock_get, \
+                    patch('PyQt6.QtWidgets.QProgressDialog'):
+                path = updater.download_update('http://example.com/setup.zip')
+            return path, mock_get.call_count
+
+        path, fetches = download('"v1"')
+        assert fetches == 1
+        assert download('"v1"') == (path, 0)
+        # A new artifact behind the same URL is fetched again
+        assert download('"v2"') == (path, 1)
+        with open(path, 'rb') as f:
+            assert f.read() == body
+
+    def test_download_update_reuse_skips_rehash(self):
+        """Test that the digest verified while downloading is reused instead of re-reading the file"""
+        import hashlib
+        updater = Updater("1.0.0")
+        body = b'exe bytes'
+        expected = hashlib.sha256(body).hexdigest()
+        head = _release_response(headers={'Content-Length': str(len(body))})
+
+        def download():
+            response = Mock()
+            response.headers = {'content-length': str(len(body))}
+            response.iter_content.return_value = iter([body])
+            with patch('requests.Session.head', return_value=head), \
+                    patch('requests.Session.get', return_value=response) as mock_get, \
+                    patch('updater.hashlib.file_digest') as mock_digest, \
+                    patch('PyQt6.QtWidgets.QProgressDialog'):
+                path = updater.download_update('http://example.com/lol-viewer.exe', expected)
+            return path, mock_get.call_count, mock_digest.call_count
+
+        path, fetches, rehashes = download()
+        assert (fetches, rehashes) == (1, 0)
+        assert download() == (path, 0, 0)
+        os.unlink(path)
+
+    @pytest.mark.parametrize("honour_ranges", [True, False])
+    def test_download_update_parallel_ranges(self, honour_ranges):
+        """Test ranged parallel download (with a resumed part) and the full-body fallback"""
+        updater = Updater("1.0.0")
+        body = bytes(range(256)) * 400
+        failed_once = set()
+
+        def fake_get(url, headers=None, stream=False, timeout=None):
+            response = Mock()
+            requested = (headers or {}).get('Range')
+            if not honour_ranges or requested is None:
+                response.status_code = 200
+                response.headers = {'content-length': str(len(body))}
+                response.iter_content.return_value = iter([body])
+                return response
+            start, end = map(int, requested[len('bytes='):].split('-'))
+            data = body[start:end + 1]
+            response.status_code = 206
+            if start == 0 and start not in failed_once:
+                # First part drops the connection halfway through once
+                failed_once.add(start)
+
+                def broken(chunk_size):
+                    yield data[:100]
+                    raise IOError("connection reset")
+                response.iter_content.side_effect = broken
+            else:
+                response.iter_content.return_value = iter([data[:50], data[50:]])
+            return response
+
+        head = _release_response(headers={'Accept-Ranges': 'bytes', 'Content-Length': str(len(body))})
+        with patch.object(Updater, 'RANGE_MIN_SIZE', 1), \
+                patch('requests.Session.head', return_value=head), \
+                patch('requests.Session.get', side_effect=fake_get) as mock_get, \
+                patch('PyQt6.QtWidgets.QProgressDialog'):
+            path = updater.download_update('http://example.com/setup.zip')
+
+        try:
+            with open(path, 'rb') as f:
+                assert f.read() == body
+            ranges = [c.kwargs.get('headers', {}).get('Range') for c in mock_get.call_args_list]
+            if honour_ranges:
+                # 4 parts + 1 resume of the first part from byte 100
+                assert len(ranges) == Updater.DOWNLOAD_PARTS + 1
+                assert 'bytes=100-25599' in ranges
+            else:
+                assert ranges[-1] is None
+        finally:
+            os.unlink(path)
+
+    @pytest.mark.parametrize("outcome", ["accept", "decline", "prefetch_fails"])
+    def test_check_and_update_prefetches_during_prompt(self, isolated_cache, outcome):
+        """Test the download started under the prompt: joined, cancelled, or retried after a failure"""
+        import threading
+        import time
+        updater = Updater("1.0.0")
+        url = 'http://example.com/lol-viewer.exe'
+        release_info = {'tag_name': 'v2.0.0', 'assets': [{'name': 'lol-viewer.exe', 'browser_download_url': url}]}
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_stream(chunk_size):
+            started.set()
+            yield b'first'
+            release.wait(5)
+            if outcome == "prefetch_fails":
+                raise IOError("connection reset")
+            yield b'second'
+
+        def fake_get(*args, **kwargs):
+            response = Mock()
+            response.headers = {}
+            if started.is_set():
+                # The retry after a failed prefetch
+                response.iter_content.return_value = iter([b'first', b'second'])
+            else:
+                response.iter_content.side_effect = slow_stream
+            return response
+
+        def prompt(info):
+            # The transfer is already running before the user answers
+            assert started.wait(5)
+            # ...on daemon threads, so an abandoned download cannot hold up exit
+            assert all(t.daemon for t in threading.enumerate() if t.name.startswith('update-'))
+            # Let it continue only once the answer has been acted on
+            threading.Timer(0.5, release.set).start()
+            return outcome != "decline"
+
+        with patch.object(updater, 'check_for_updates', return_value=(True, release_info)), \
+                patch.object(updater, 'prompt_update', side_effect=prompt), \
+                patch.object(updater, 'apply_update') as mock_apply, \
+                patch('requests.Session.head', return_value=_release_response()), \
+                patch('requests.Session.get', side_effect=fake_get) as mock_get, \
+                patch('PyQt6.QtWidgets.QProgressDialog'), \
+                patch('PyQt6.QtWidgets.QMessageBox'):
+            started_at = time.monotonic()
+            assert updater.check_and_update() is (outcome != "decline")
+            elapsed = time.monotonic() - started_at
+            # The worker is still blocked mid-download; declining must not wait for it
+            if outcome == "decline":
+                assert elapsed < 0.4
+                for thread in threading.enumerate():
+                    if thread.name == 'update-prefetch':
+                        thread.join(5)
+
+        assert updater._prefetch is None
+        if outcome == "decline":
+            mock_apply.assert_not_called()
+            assert mock_get.call_count == 1
+            # The cancelled worker removed its partial file by itself
+            assert list(isolated_cache.iterdir()) == []
+        else:
+            assert mock_get.call_count == (1 if outcome == "accept" else 2)
+            with open(mock_apply.call_args.args[0], 'rb') as f:
+                assert f.read() == b'firstsecond'
+
+    def test_cancelled_prefetch_stops_after_probe(self, isolated_cache):
+        """Test that a prefetch declined during the HEAD probe neither downloads nor re-hashes"""
+        import threading
+        from updater import DownloadCancelled
+        updater = Updater("1.0.0")
+        cancel = threading.Event()
+
+        def slow_head(*args, **kwargs):
+            cancel.set()  # the user declines while the probe is in flight
+            return _release_response(headers={'Content-Length': '9'})
+
+        with patch('requests.Session.head', side_effect=slow_head), \
+                patch('requests.Session.get') as mock_get, \
+                patch('updater.hashlib.file_digest') as mock_digest:
+            with pytest.raises(DownloadCancelled):
+                updater._fetch_installer('http://example.com/setup.zip', '.zip', '0' * 64,
+                                         lambda *a: None, cancel)
+
+        mock_get.assert_not_called()
+        mock_digest.assert_not_called()
+        assert list(isolated_cache.iterdir()) == []
+
+    def test_download_ranges_failure_closes_stalled_workers(self, tmp_path):
+        """Test that one failed range closes the others' responses instead of waiting out their reads"""
+        import threading
+        import time
+        updater = Updater("1.0.0")
+        total_size = 4000
+        path = tmp_path / 'part'
+        path.write_bytes(b'\0' * total_size)
+        responses = []
+
+        def fake_get(url, headers=None, stream=False, timeout=None):
+            start = int(headers['Range'][len('bytes='):].split('-')[0])
+            response = Mock(status_code=206)
+            closed = threading.Event()
+            response.close.side_effect = closed.set
+            if start == 0:
+                response.iter_content.side_effect = ValueError("corrupt chunk")
+            else:
+                def stalled(chunk_size):
+                    yield b'x'
+                    # Blocks like a socket read until the response is closed
+                    assert closed.wait(10)
+                    raise ConnectionError("closed")
+                response.iter_content.side_effect = stalled
+            responses.append(response)
+            return response
+
+        started_at = time.monotonic()
+        with patch('requests.Session.get', side_effect=fake_get):
+            with pytest.raises(ValueError):
+                updater._download_ranges('http://example.com/setup.zip', str(path), total_size,
+                                         lambda *a: None)
+
+        assert time.monotonic() - started_at < 5
+        assert len(responses) == Updater.DOWNLOAD_PARTS
+        assert all(r.close.called for r in responses)
+        assert not any(t.name.startswith('update-download') for t in threading.enumerate())
+
+    def test_run_off_gui_thread_keeps_event_loop(self, qapp):
+        """Test that background work runs on another thread while the caller ticks"""
+        import threading
+        import time
+        updater = Updater("1.0.0")
+        ticks = []
+
+        def work(value):
+            time.sleep(0.3)
+            return value, threading.current_thread() is threading.main_thread()
+
+        result = updater._run_off_gui_thread(work, 42, on_tick=lambda: ticks.append(1))
+
+        assert result == (42, False)
+        assert len(ticks) >= 2
+
+    def test_extract_exe_from_zip(self, tmp_path):
+        """Test that the installer is extracted flat, skipping __MACOSX entries"""
+        import zipfile
+        zip_path = tmp_path / 'setup.zip'
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('__MACOSX/dist/._lol-viewer-setup.exe', b'resource fork')
+            zf.writestr('README.txt', b'readme')
+            zf.writestr('dist/lol-viewer-setup.exe', b'MZ installer')
+
+        updater = Updater("1.0.0")
+        path = updater._extract_exe_from_zip(str(zip_path))
+
+        assert os.path.basename(path) == 'lol-viewer-setup.exe'
+        with open(path, 'rb') as f:
+            assert f.read() == b'MZ installer'
+        os.unlink(path)
+        os.rmdir(os.path.dirname(path))
+
     def test_update_script_generation(self):
         """Test that update script is generated correctly"""
         updater = Updater("1.0.0")
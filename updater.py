@@ -1,21 +1,85 @@
 """
 Auto-update functionality using GitHub Releases API
+
+requests, packaging, zipfile and the Qt dialogs are imported inside the
+methods that need them, so constructing an Updater stays cheap.
 """
+import functools
+import hashlib
 import os
 import sys
 import logging
-import requests
 import tempfile
 import subprocess
-import zipfile
+import threading
+import time
 from pathlib import Path
-from packaging import version
-from PyQt6.QtWidgets import QMessageBox, QProgressDialog
-from PyQt6.QtCore import Qt
+
+import app_cache
+
+# orjson decodes the release payload straight from bytes and is much faster
+# than the stdlib; fall back to json when it is not installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _parse_version(text: str):
+    """packaging.version.parse, memoized (the same tags come back check after check)"""
+    from packaging import version
+    return version.parse(text)
+
+
+# Batch script that swaps in the new executable ({current}/{new} are paths)
+_UPDATE_SCRIPT_TEMPLATE = """@echo off
+setlocal
+
+REM Wait for the current app to exit
+timeout /t 2 /nobreak >nul
+
+REM Replace exe
+move /y "{new}" "{current}"
+
+REM Restart app (best effort)
+start "" "{current}"
+"""
+
+
+def _start_daemon(fn, *args, name: str):
+    """Run fn(*args) on a daemon thread; returns (thread, Future of its result)
+
+    Unlike ThreadPoolExecutor workers, these threads never hold up interpreter
+    exit, which matters for downloads the user may abandon.
+    """
+    from concurrent.futures import Future
+
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread, future
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download worker when its transfer was cancelled"""
+
+
 class Updater:
     """Handles application updates from GitHub Releases"""
 
@@ -33,6 +97,37 @@ class Updater:
     # where the app detects a newer version is available but downloads an older artifact.
     # Unfortunately, this is an acceptable trade-off to ensure downloads complete successfully for users in Asia.
     NIGHTLY_LINK_URL = "https://nightly.link/kc7891/lol-viewer/workflows/release/main/lol-viewer-setup.zip"
+    # Last release response plus its ETag/Last-Modified validators, so repeat
+    # checks can be answered with a bodyless 304 (which is also not rate limited)
+    RELEASE_CACHE_FILE = "latest-release.json"
+    # Within this many seconds of the last check the cached release is used
+    # without any request
+    RELEASE_CACHE_TTL = 6 * 60 * 60
+    # Only these release fields (and asset name/URL) are used; the rest of the
+    # payload (uploader objects, per-asset metadata, ...) is dropped on receipt
+    RELEASE_FIELDS = ("tag_name", "name", "body", "published_at")
+    ASSET_FIELDS = ("name", "browser_download_url", "digest")
+    # Download read size; large reads keep the per-chunk Python work negligible
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+    # Large downloads are fetched as this many concurrent byte ranges when the
+    # server supports them (per-connection throughput is often capped)
+    DOWNLOAD_PARTS = 4
+    RANGE_MIN_SIZE = 8 * 1024 * 1024
+    RANGE_RETRIES = 2
+    # How long a finished/failed ranged download waits for its workers to exit
+    RANGE_JOIN_TIMEOUT = 5.0
+    # How often the GUI thread refreshes progress while work runs in the background
+    UI_POLL_MS = 100
+    # Last downloaded installer (kept in the app cache for reuse)
+    INSTALLER_CACHE_FILE = "installer-cache.json"
+    # Copy buffer for inflating the installer out of the downloaded zip
+    EXTRACT_BUFFER_SIZE = 1024 * 1024
+    # A release JSON is a few KB; stop reading anything implausibly large
+    MAX_RELEASE_BYTES = 1_000_000
+    API_HEADERS = {
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28',
+    }
 
     def __init__(self, current_version: str, parent_widget=None):
         """
@@ -44,52 +139,141 @@ class Updater:
         """
         self.current_version = current_version
         self.parent_widget = parent_widget
+        # version.parse(current_version), filled in by the first check
+        self._current_parsed = None
+        # Keep-alive session shared by the release check and the download
+        self._session = None
+        # (url, thread, future, progress, cancel) of the installer fetched during the prompt
+        self._prefetch = None
+
+    def _get_session(self):
+        """Return the HTTP session used for GitHub requests (created on first use)"""
+        if self._session is None:
+            import requests
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            # requests already asks for gzip; identify ourselves to GitHub
+            session.headers['User-Agent'] = f"lol-viewer-updater/{self.current_version}"
+            # Retry transient connection failures and gateway errors with a short
+            # backoff; the pool has room for every parallel download range
+            retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=self.DOWNLOAD_PARTS + 1, max_retries=retry
+            )
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
 
-    def check_for_updates(self) -> tuple[bool, dict | None]:
+    def check_for_updates(self, use_cache: bool = True) -> tuple[bool, dict | None]:
         """
         Check if a new version is available
 
+        Args:
+            use_cache: Answer from the cached release while it is younger than
+                RELEASE_CACHE_TTL (False always asks GitHub, conditionally)
+
         Returns:
             Tuple of (has_update, release_info)
             - has_update: True if new version available
             - release_info: Dict with release information when check succeeds; None on failure
         """
+        import requests
+
         try:
-            logger.info(f"Checking for updates (current version: {self.current_version})")
-            response = requests.get(self.GITHUB_API_URL, timeout=5)
-            response.raise_for_status()
+            logger.info("Checking for updates (current version: %s)", self.current_version)
+            cached = self._read_release_cache(self.RELEASE_CACHE_TTL) if use_cache else {}
+            if cached:
+                logger.info("Using cached release info")
+                release_data = cached["release"]
+            else:
+                release_data = self._fetch_latest_release()
 
-            release_data = response.json()
             latest_version = release_data.get('tag_name', '').lstrip('v')
 
             if not latest_version:
                 logger.warning("Could not determine latest version from GitHub")
                 return False, None
 
-            logger.info(f"Latest version on GitHub: {latest_version}")
+            logger.info("Latest version on GitHub: %s", latest_version)
 
             # Compare versions
-            current_parsed = version.parse(self.current_version)
-            latest_parsed = version.parse(latest_version)
-
-            logger.info(f"Version comparison: {current_parsed} vs {latest_parsed}")
+            if self._current_parsed is None:
+                self._current_parsed = _parse_version(self.current_version)
+            current_parsed = self._current_parsed
+            latest_parsed = _parse_version(latest_version)
 
             if latest_parsed > current_parsed:
-                logger.info(f"✓ Update available: {self.current_version} → {latest_version}")
+                logger.info("✓ Update available: %s → %s", self.current_version, latest_version)
                 return True, release_data
             else:
-                logger.info(f"✓ Application is up to date (current: {self.current_version}, latest: {latest_version})")
+                logger.info("✓ Application is up to date (current: %s, latest: %s)", self.current_version, latest_version)
                 # Important: returning None here makes callers unable to distinguish
                 # "up to date" from "failed to check". Return release data on success.
                 return False, release_data
 
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Failed to check for updates: {e}")
+            logger.warning("Failed to check for updates: %s", e)
             return False, None
         except Exception as e:
-            logger.error(f"Unexpected error while checking updates: {e}")
+            logger.error("Unexpected error while checking updates: %s", e)
             return False, None
 
+    def _read_release_cache(self, max_age: float | None = None) -> dict:
+        """Return the cached release entry, or {} if missing, invalid or older than *max_age*"""
+        cached = app_cache.read_json(self.RELEASE_CACHE_FILE, max_age=max_age)
+        if not isinstance(cached, dict) or not isinstance(cached.get("release"), dict):
+            return {}
+        return cached
+
+    def _slim_release(self, release_data: dict) -> dict:
+        """Keep only the release fields the updater reads"""
+        release = {key: release_data[key] for key in self.RELEASE_FIELDS if key in release_data}
+        release["assets"] = [
+            {key: asset[key] for key in self.ASSET_FIELDS if key in asset}
+            for asset in release_data.get("assets") or ()
+        ]
+        return release
+
+    def _fetch_latest_release(self) -> dict:
+        """Fetch the latest release JSON, revalidating the cached copy if there is one"""
+        cached = self._read_release_cache()
+        headers = dict(self.API_HEADERS)
+        if cached.get("etag"):
+            headers['If-None-Match'] = cached["etag"]
+        if cached.get("last_modified"):
+            headers['If-Modified-Since'] = cached["last_modified"]
+        # Streamed, so the body is only read up to MAX_RELEASE_BYTES
+        response = self._get_session().get(self.GITHUB_API_URL, headers=headers, timeout=5, stream=True)
+        try:
+            if response.status_code == 304 and cached:
+                logger.info("Latest release unchanged (304 Not Modified)")
+                meta = cached
+            else:
+                response.raise_for_status()
+                meta = {
+                    "release": self._slim_release(_json_loads(self._read_release_body(response))),
+                    "etag": response.headers.get('ETag'),
+                    "last_modified": response.headers.get('Last-Modified'),
+                }
+        finally:
+            response.close()
+        # Rewriting also refreshes the mtime used for the TTL
+        app_cache.write_json(self.RELEASE_CACHE_FILE, meta)
+        return meta["release"]
+
+    def _read_release_body(self, response) -> bytes:
+        """Read a streamed release response, refusing bodies over MAX_RELEASE_BYTES"""
+        size = int(response.headers.get('Content-Length') or 0)
+        if size > self.MAX_RELEASE_BYTES:
+            raise ValueError(f"Release response too large ({size} bytes)")
+        body = bytearray()
+        # Content-Length may be missing (chunked) or wrong: cap what is actually read
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body += chunk
+            if len(body) > self.MAX_RELEASE_BYTES:
+                raise ValueError(f"Release response too large (over {self.MAX_RELEASE_BYTES} bytes)")
+        return bytes(body)
+
     def prompt_update(self, release_info: dict) -> bool:
         """
         Show update dialog to user
@@ -100,6 +284,8 @@ class Updater:
         Returns:
             True if user wants to update, False otherwise
         """
+        from PyQt6.QtWidgets import QMessageBox
+
         latest_version = release_info.get('tag_name', 'Unknown').lstrip('v')
         release_notes = release_info.get('body', 'No release notes available.')
 
@@ -121,6 +307,15 @@ class Updater:
 
         return reply == QMessageBox.StandardButton.Yes
 
+    @functools.cached_property
+    def _asset_names(self) -> tuple[str, str]:
+        """(preferred, fallback) release asset names for the running exe variant"""
+        want_debug = "debug" in os.path.basename(sys.argv[0]).lower()
+        # Fallback order: if preferred not found, try the other variant.
+        if want_debug:
+            return "lol-viewer-debug.exe", "lol-viewer.exe"
+        return "lol-viewer.exe", "lol-viewer-debug.exe"
+
     def get_download_url(self, release_info: dict) -> str:
         """
         Get the download URL for the installer zip
@@ -135,20 +330,19 @@ class Updater:
         # In tests (or when explicitly requested), use GitHub Release assets.
         if os.environ.get("PYTEST_CURRENT_TEST") or os.environ.get("LOL_VIEWER_USE_RELEASE_ASSETS") == "1":
             assets = release_info.get("assets", []) if release_info else []
-            exe_name = os.path.basename(sys.argv[0]).lower()
-            want_debug = "debug" in exe_name
-
-            preferred_names = ["lol-viewer-debug.exe"] if want_debug else ["lol-viewer.exe"]
-            # Fallback order: if preferred not found, try the other variant.
-            fallback_names = ["lol-viewer.exe"] if want_debug else ["lol-viewer-debug.exe"]
-
-            for target in preferred_names + fallback_names:
-                for asset in assets:
-                    if asset.get("name") == target:
-                        return asset.get("browser_download_url")
-            return None
-
-        logger.info(f"Using nightly.link for faster downloads: {self.NIGHTLY_LINK_URL}")
+            preferred_name, fallback_name = self._asset_names
+
+            # Single pass: return on the preferred asset, remember the first fallback
+            fallback = None
+            for asset in assets:
+                name = asset.get("name")
+                if name == preferred_name:
+                    return asset.get("browser_download_url")
+                if name == fallback_name and fallback is None:
+                    fallback = asset
+            return fallback.get("browser_download_url") if fallback is not None else None
+
+        logger.info("Using nightly.link for faster downloads: %s", self.NIGHTLY_LINK_URL)
         return self.NIGHTLY_LINK_URL
 
     def _create_update_script(self, current_exe_path: str, new_exe_path: str) -> str:
@@ -156,35 +350,47 @@ class Updater:
 
         This is primarily used for unit tests and legacy update flows.
         """
-        script_content = f"""@echo off
-setlocal
-
-REM Wait for the current app to exit
-timeout /t 2 /nobreak >nul
-
-REM Replace exe
-move /y "{new_exe_path}" "{current_exe_path}"
-
-REM Restart app (best effort)
-start "" "{current_exe_path}"
-"""
+        script_content = _UPDATE_SCRIPT_TEMPLATE.format(current=current_exe_path, new=new_exe_path)
         fd, script_path = tempfile.mkstemp(suffix=".bat", prefix="lol_viewer_update_")
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            f.write(script_content)
+        try:
+            # Native line endings (CRLF on Windows), as a text-mode write would give
+            os.write(fd, script_content.replace("\n", os.linesep).encode("utf-8"))
+        finally:
+            os.close(fd)
         return script_path
 
-    def download_update(self, download_url: str) -> str:
+    def get_expected_sha256(self, release_info: dict, download_url: str) -> str | None:
+        """
+        Get the SHA-256 GitHub publishes for the asset behind *download_url*
+
+        Returns:
+            Lower-case hex digest, or None if the URL is not a release asset with
+            a sha256 digest (e.g. the nightly.link download)
+        """
+        for asset in (release_info or {}).get("assets") or ():
+            if asset.get("browser_download_url") == download_url:
+                algorithm, _, digest = (asset.get("digest") or "").partition(":")
+                if algorithm == "sha256" and digest:
+                    return digest.lower()
+                return None
+        return None
+
+    def download_update(self, download_url: str, expected_sha256: str | None = None) -> str:
         """
         Download the installer
 
         Args:
             download_url: URL to download from
+            expected_sha256: Hex digest the download must match
 
         Returns:
             Path to downloaded installer or None if failed
         """
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtWidgets import QMessageBox, QProgressDialog
+
         try:
-            logger.info(f"Downloading installer from: {download_url}")
+            logger.info("Downloading installer from: %s", download_url)
 
             # Determine file extension
             suffix = '.exe' if download_url.endswith('.exe') else '.zip'
@@ -201,42 +407,53 @@ start "" "{current_exe_path}"
             progress.setMinimumDuration(0)  # Show immediately
             progress.setCancelButton(None)  # Remove cancel button
 
-            # Download with progress (long timeout for large files)
-            response = requests.get(download_url, stream=True, timeout=300)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            total_mb = total_size / (1024 * 1024) if total_size > 0 else 0
-            logger.info(f"Download size: {total_mb:.1f} MB")
-
-            # Create temp file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            temp_path = temp_file.name
-
-            downloaded = 0
-            chunk_size = 8192
-
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                temp_file.write(chunk)
-                downloaded += len(chunk)
+            # A prefetch started while the prompt was shown already has progress
+            prefetch = self._take_prefetch(download_url)
+            # Written by the transfer thread, read by the GUI-thread timer
+            latest = prefetch[1] if prefetch is not None else [0, 0]
+            shown_percent = -1
+
+            def report(downloaded: int, total_size: int):
+                latest[:] = (downloaded, total_size)
+
+            def show_progress():
+                nonlocal shown_percent
+                downloaded, total_size = latest
+                if total_size <= 0:
+                    return
+                percent = downloaded * 100 // total_size
+                # Repaint the dialog only when the percentage moves
+                if percent == shown_percent:
+                    return
+                shown_percent = percent
+                progress.setValue(percent)
+                progress.setLabelText(
+                    f"Downloading installer...\n"
+                    f"{downloaded / (1024 * 1024):.1f} MB / {total_size / (1024 * 1024):.1f} MB ({percent}%)"
+                )
 
-                if total_size > 0:
-                    percent = int(downloaded * 100 / total_size)
-                    downloaded_mb = downloaded / (1024 * 1024)
-                    progress.setValue(percent)
-                    progress.setLabelText(
-                        f"Downloading installer...\n"
-                        f"{downloaded_mb:.1f} MB / {total_mb:.1f} MB ({percent}%)"
+            try:
+                installer_path = None
+                if prefetch is not None:
+                    try:
+                        installer_path = self._wait_pumping_events(prefetch[0], on_tick=show_progress)
+                    except Exception as e:
+                        # Retry below with a fresh transfer
+                        logger.warning("Background download failed, downloading again: %s", e)
+                        latest[:] = (0, 0)
+                if installer_path is None:
+                    installer_path = self._run_off_gui_thread(
+                        self._fetch_installer, download_url, suffix, expected_sha256, report,
+                        on_tick=show_progress,
                     )
+            finally:
+                progress.close()
 
-            temp_file.close()
-            progress.close()
-
-            logger.info(f"Download completed: {temp_path}")
-            return temp_path
+            logger.info("Download completed: %s", installer_path)
+            return installer_path
 
         except Exception as e:
-            logger.error(f"Failed to download installer: {e}")
+            logger.error("Failed to download installer: %s", e)
             QMessageBox.critical(
                 self.parent_widget,
                 "Download Failed",
@@ -244,6 +461,361 @@ start "" "{current_exe_path}"
             )
             return None
 
+    def _run_off_gui_thread(self, fn, *args, on_tick=None):
+        """Run fn(*args) on a worker thread and return its result (or raise its error)
+
+        While it runs, the calling thread keeps the Qt event loop going and
+        calls *on_tick* every UI_POLL_MS, so dialogs stay responsive.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="updater") as pool:
+            return self._wait_pumping_events(pool.submit(fn, *args), on_tick)
+
+    def _wait_pumping_events(self, future, on_tick=None):
+        """Return *future*'s result, running the Qt event loop until it is done"""
+        from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+        if QCoreApplication.instance() is not None:
+            loop = QEventLoop()
+            timer = QTimer()
+
+            def tick():
+                if on_tick is not None:
+                    on_tick()
+                if future.done():
+                    loop.quit()
+
+            timer.timeout.connect(tick)
+            timer.start(self.UI_POLL_MS)
+            if not future.done():
+                loop.exec()
+            timer.stop()
+        result = future.result()
+        if on_tick is not None:
+            on_tick()
+        return result
+
+    def _start_prefetch(self, download_url: str, expected_sha256: str | None):
+        """Start downloading the installer in the background while the user decides"""
+        suffix = '.exe' if download_url.endswith('.exe') else '.zip'
+        progress = [0, 0]
+        cancel = threading.Event()
+
+        def report(downloaded: int, total_size: int):
+            progress[:] = (downloaded, total_size)
+
+        thread, future = _start_daemon(
+            self._fetch_installer, download_url, suffix, expected_sha256, report, cancel,
+            name="update-prefetch",
+        )
+        self._prefetch = (download_url, thread, future, progress, cancel)
+
+    def _take_prefetch(self, download_url: str):
+        """Return (future, progress) of a running prefetch for *download_url*, if any"""
+        if self._prefetch is None:
+            return None
+        if self._prefetch[0] != download_url:
+            self._cancel_prefetch()
+            return None
+        prefetch, self._prefetch = self._prefetch, None
+        return prefetch[2], prefetch[3]
+
+    def _cancel_prefetch(self):
+        """Ask a running prefetch to stop (without blocking the GUI thread)
+
+        The worker notices the event at its next checkpoint and removes its
+        partial file itself; it is a daemon thread, so it never delays exit.
+        """
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch is not None:
+            prefetch[4].set()
+
+    def _fetch_installer(self, download_url: str, suffix: str,
+                         expected_sha256: str | None, report,
+                         cancel: threading.Event | None = None) -> str:
+        """Return the path of the installer behind *download_url* (runs off the GUI thread)
+
+        The last download is kept in the app cache and reused while the server
+        still reports the same ETag and size (and, when GitHub publishes one,
+        the same SHA-256) - e.g. after the user declined the update earlier.
+        Setting *cancel* aborts the transfer and removes the partial file.
+        """
+        probe = self._probe_download(download_url)
+        # The probe may take seconds; a declined prefetch stops here
+        self._raise_if_cancelled(cancel)
+        # An error page from the download host, not an installer: fail before streaming it
+        self._reject_error_page(probe["type"])
+        cached = self._reusable_installer(download_url, probe, expected_sha256, cancel)
+        if cached:
+            logger.info("Reusing previously downloaded installer: %s", cached)
+            return cached
+
+        # Size the progress bar while the transfer connects
+        report(0, probe["size"])
+        cache_dir = app_cache.get_cache_dir()
+        # Create temp file; chunks go straight to the fd (no BufferedWriter copy)
+        fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=cache_dir)
+        try:
+            try:
+                digest = self._download_to_file(download_url, fd, temp_path, probe, expected_sha256, report, cancel)
+            finally:
+                os.close(fd)
+            installer_path = os.path.join(cache_dir, "update-installer" + suffix)
+            os.replace(temp_path, installer_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        stat = os.stat(installer_path)
+        app_cache.write_json(self.INSTALLER_CACHE_FILE, {
+            "url": download_url,
+            "etag": probe["etag"],
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            # Verified while downloading, so a later reuse need not re-read the file
+            "sha256": digest,
+            "path": installer_path,
+        })
+        return installer_path
+
+    def _reusable_installer(self, download_url: str, probe: dict, expected_sha256: str | None,
+                            cancel: threading.Event | None = None) -> str | None:
+        """Return the cached installer path if it still matches the server's copy"""
+        cached = app_cache.read_json(self.INSTALLER_CACHE_FILE)
+        if not isinstance(cached, dict) or cached.get("url") != download_url:
+            return None
+        path = cached.get("path")
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        size = stat.st_size
+        if size != cached.get("size") or (probe["size"] and probe["size"] != size):
+            return None
+        if expected_sha256:
+            if cached.get("sha256") == expected_sha256.lower() and cached.get("mtime_ns") == stat.st_mtime_ns:
+                return path
+            # Re-hashing reads the whole file; skip it if the prefetch was declined
+            self._raise_if_cancelled(cancel)
+            with open(path, 'rb') as f:
+                return path if hashlib.file_digest(f, 'sha256').hexdigest() == expected_sha256.lower() else None
+        # Without a published digest the ETag is the only proof the file is current
+        if not probe["etag"] or probe["etag"] != cached.get("etag"):
+            return None
+        return path
+
+    def _download_to_file(self, download_url: str, fd: int, temp_path: str, probe: dict,
+                          expected_sha256: str | None, report,
+                          cancel: threading.Event | None = None) -> str | None:
+        """Transfer *download_url* into the open temp file
+
+        Returns the verified SHA-256 hex digest, or None if none was expected.
+        """
+        total_size = probe["size"] if probe["ranges"] and probe["size"] >= self.RANGE_MIN_SIZE else 0
+        if total_size:
+            logger.info("Download size: %.1f MB (%d parallel ranges)",
+                        total_size / (1024 * 1024), self.DOWNLOAD_PARTS)
+            self._preallocate(fd, total_size)
+            if self._download_ranges(download_url, temp_path, total_size, report, cancel):
+                if expected_sha256:
+                    # SHA-256 state cannot be merged across ranges: hash the file once
+                    with open(temp_path, 'rb') as f:
+                        digest = hashlib.file_digest(f, 'sha256').hexdigest()
+                    if digest != expected_sha256.lower():
+                        raise ValueError("Checksum mismatch (SHA-256) - the download is corrupted")
+                    return digest
+                return None
+            # Server ignored Range: start over with a single stream
+            os.ftruncate(fd, 0)
+        return self._download_stream(download_url, fd, report, expected_sha256, cancel)
+
+    @staticmethod
+    def _preallocate(fd: int, size: int):
+        """Size the temp file for the range writers, reserving its blocks where the OS can"""
+        if hasattr(os, "posix_fallocate"):
+            try:
+                # Real extents up front: no sparse holes filled in piecemeal by the writers
+                os.posix_fallocate(fd, 0, size)
+                return
+            except OSError:
+                pass
+        os.ftruncate(fd, size)
+
+    @staticmethod
+    def _raise_if_cancelled(cancel: threading.Event | None):
+        """Raise DownloadCancelled once *cancel* is set"""
+        if cancel is not None and cancel.is_set():
+            raise DownloadCancelled("Download cancelled")
+
+    @staticmethod
+    def _reject_error_page(content_type: str):
+        """Raise if *content_type* is a web page or API error rather than the installer"""
+        if content_type.startswith(("text/html", "application/json")):
+            raise ValueError(f"The download link returned {content_type.split(';')[0]} instead of the installer")
+
+    def _probe_download(self, download_url: str) -> dict:
+        """HEAD the download: {"size", "ranges", "etag", "type"}
+
+        Values stay empty ("unknown") if the probe fails or the host refuses
+        HEAD, since an error response describes the error page, not the file.
+        """
+        probe = {"size": 0, "ranges": False, "etag": None, "type": ""}
+        try:
+            response = self._get_session().head(download_url, allow_redirects=True, timeout=10)
+            if not response.ok:
+                logger.info("Download probe answered HTTP %s, using a single stream", response.status_code)
+                return probe
+            headers = response.headers
+            probe["size"] = int(headers.get('Content-Length') or 0)
+            probe["ranges"] = headers.get('Accept-Ranges', '').lower() == 'bytes'
+            probe["etag"] = headers.get('ETag')
+            probe["type"] = (headers.get('Content-Type') or '').lower()
+        except Exception as e:
+            logger.info("Download probe failed, using a single stream: %s", e)
+        return probe
+
+    def _download_stream(self, download_url: str, fd: int, report, expected_sha256: str | None,
+                         cancel: threading.Event | None = None) -> str | None:
+        """Stream the whole download into *fd* over one connection, hashing as it goes"""
+        # Long timeout for large files
+        response = self._get_session().get(download_url, stream=True, timeout=300)
+        response.raise_for_status()
+        self._reject_error_page((response.headers.get('content-type') or '').lower())
+
+        total_size = int(response.headers.get('content-length', 0))
+        logger.info("Download size: %.1f MB", total_size / (1024 * 1024))
+
+        downloaded = 0
+        sha256 = hashlib.sha256() if expected_sha256 else None
+        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+            if cancel is not None and cancel.is_set():
+                response.close()
+                raise DownloadCancelled("Download cancelled")
+            if sha256 is not None:
+                sha256.update(chunk)
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+            downloaded += len(chunk)
+            report(downloaded, total_size)
+        if sha256 is None:
+            return None
+        digest = sha256.hexdigest()
+        if digest != expected_sha256.lower():
+            raise ValueError("Checksum mismatch (SHA-256) - the download is corrupted")
+        return digest
+
+    def _download_ranges(self, download_url: str, path: str, total_size: int, report,
+                         cancel: threading.Event | None = None) -> bool:
+        """Fetch DOWNLOAD_PARTS byte ranges concurrently into the pre-sized file at *path*
+
+        Returns False if the server answered a range request with the full body
+        (no Range support).
+        """
+        from concurrent.futures import FIRST_EXCEPTION, wait
+
+        part_size = -(-total_size // self.DOWNLOAD_PARTS)
+        ranges = [(start, min(start + part_size, total_size) - 1)
+                  for start in range(0, total_size, part_size)]
+        downloaded = [0]
+        lock = threading.Lock()
+        stop = threading.Event()
+        # Responses the workers are streaming; closed on stop so a worker blocked
+        # in a read (up to the 300 s timeout) wakes up instead of lingering
+        live = set()
+
+        def on_bytes(count: int):
+            with lock:
+                downloaded[0] += count
+
+        # Daemon threads: an abandoned (cancelled) download never blocks app exit
+        workers = [
+            _start_daemon(self._download_range, download_url, path, start, end, on_bytes, stop,
+                          live, lock, name=f"update-download-{index}")
+            for index, (start, end) in enumerate(ranges)
+        ]
+        futures = [future for _, future in workers]
+        try:
+            pending = futures
+            while pending:
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_EXCEPTION)
+                report(downloaded[0], total_size)
+                if any(f.exception() is not None for f in finished):
+                    break
+                self._raise_if_cancelled(cancel)
+            stop.set()
+            for future in futures:
+                # Re-raises the first failure
+                if not future.result():
+                    return False
+            return True
+        finally:
+            stop.set()
+            with lock:
+                responses = list(live)
+            for response in responses:
+                response.close()
+            # Daemons: one stuck in a read past the timeout is left behind, not waited on
+            deadline = time.monotonic() + self.RANGE_JOIN_TIMEOUT
+            for thread, _ in workers:
+                thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _download_range(self, download_url: str, path: str, start: int, end: int,
+                        on_bytes, stop: threading.Event, live: set, lock: threading.Lock) -> bool:
+        """Fetch bytes *start*..*end* (inclusive) into the same offsets of *path*
+
+        Interrupted transfers resume from the last written byte, up to
+        RANGE_RETRIES times with exponential backoff. Returns False if the
+        server ignored the Range header. While streaming, the response sits
+        in *live* (guarded by *lock*) so that setting *stop* can close it.
+        """
+        import requests
+
+        pos = start
+        for attempt in range(self.RANGE_RETRIES + 1):
+            try:
+                response = self._get_session().get(
+                    download_url, headers={'Range': f'bytes={pos}-{end}'}, stream=True, timeout=300
+                )
+                with lock:
+                    live.add(response)
+                try:
+                    # Registered before this check, so a later stop always closes it
+                    if stop.is_set():
+                        return True
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        return False
+                    with open(path, 'r+b', buffering=0) as f:
+                        f.seek(pos)
+                        for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                            if stop.is_set():
+                                return True
+                            view = memoryview(chunk)
+                            while view:
+                                view = view[f.write(view):]
+                            pos += len(chunk)
+                            on_bytes(len(chunk))
+                finally:
+                    with lock:
+                        live.discard(response)
+                    response.close()
+                if pos > end:
+                    return True
+                raise IOError(f"Range {start}-{end} ended early at byte {pos}")
+            except (requests.exceptions.RequestException, OSError) as e:
+                if attempt == self.RANGE_RETRIES or stop.is_set():
+                    raise
+                logger.warning("Retrying range %s-%s: %s", pos, end, e)
+                # Backoff that a stop cuts short
+                if stop.wait(0.5 * 2 ** attempt):
+                    return True
+        return True
+
     def _extract_exe_from_zip(self, zip_path: str) -> str:
         """
         Extract exe file from zip archive
@@ -254,35 +826,34 @@ start "" "{current_exe_path}"
         Returns:
             Path to extracted exe or None if not found
         """
+        import shutil
+        import zipfile
+
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # List all files in zip
-                file_list = zip_ref.namelist()
-                logger.info(f"Files in zip: {file_list}")
-
-                # Find exe file
-                exe_file = None
-                for filename in file_list:
-                    if filename.endswith('.exe') and not filename.startswith('__MACOSX'):
-                        exe_file = filename
-                        logger.info(f"Found exe in zip: {exe_file}")
-                        break
-
-                if not exe_file:
-                    logger.error("No .exe file found in zip archive")
+                # Find exe file (single pass over the archive directory)
+                exe_info = next(
+                    (info for info in zip_ref.infolist()
+                     if info.filename.endswith('.exe') and not info.filename.startswith('__MACOSX')),
+                    None,
+                )
+
+                if exe_info is None:
+                    logger.error("No .exe file found in zip archive: %s", zip_ref.namelist())
                     return None
+                logger.info("Found exe in zip: %s", exe_info.filename)
 
-                # Extract to temp directory
+                # Stream it flat into a temp directory (no archive sub-directories)
                 temp_dir = tempfile.mkdtemp()
-                zip_ref.extract(exe_file, temp_dir)
-
-                extracted_path = os.path.join(temp_dir, exe_file)
-                logger.info(f"Extracted to: {extracted_path}")
+                extracted_path = os.path.join(temp_dir, os.path.basename(exe_info.filename))
+                with zip_ref.open(exe_info) as src, open(extracted_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, length=self.EXTRACT_BUFFER_SIZE)
+                logger.info("Extracted to: %s", extracted_path)
 
                 return extracted_path
 
         except Exception as e:
-            logger.error(f"Failed to extract exe from zip: {e}")
+            logger.error("Failed to extract exe from zip: %s", e)
             return None
 
     def _get_installation_dir(self) -> str:
@@ -300,10 +871,10 @@ start "" "{current_exe_path}"
 
             # Get the directory containing the executable
             install_dir = os.path.dirname(os.path.abspath(current_exe))
-            logger.info(f"Current installation directory: {install_dir}")
+            logger.info("Current installation directory: %s", install_dir)
             return install_dir
         except Exception as e:
-            logger.error(f"Failed to get installation directory: {e}")
+            logger.error("Failed to get installation directory: %s", e)
             return None
 
     def apply_update(self, installer_path: str):
@@ -313,6 +884,8 @@ start "" "{current_exe_path}"
         Args:
             installer_path: Path to the downloaded installer zip
         """
+        from PyQt6.QtWidgets import QMessageBox
+
         try:
             # Use sys.executable for frozen apps (PyInstaller), sys.argv[0] otherwise
             current_exe = sys.executable if getattr(sys, 'frozen', False) else sys.argv[0]
@@ -331,8 +904,9 @@ start "" "{current_exe_path}"
                 return
 
             # Extract setup.exe from zip
-            logger.info(f"Extracting installer from: {installer_path}")
-            setup_exe_path = self._extract_exe_from_zip(installer_path)
+            logger.info("Extracting installer from: %s", installer_path)
+            # Inflating ~100 MB takes a while; keep the event loop running meanwhile
+            setup_exe_path = self._run_off_gui_thread(self._extract_exe_from_zip, installer_path)
 
             if not setup_exe_path:
                 QMessageBox.critical(
@@ -342,7 +916,7 @@ start "" "{current_exe_path}"
                 )
                 return
 
-            logger.info(f"Running installer: {setup_exe_path}")
+            logger.info("Running installer: %s", setup_exe_path)
 
             # Get current installation directory to preserve it
             install_dir = self._get_installation_dir()
@@ -375,16 +949,16 @@ start "" "{current_exe_path}"
                 # duplicated drive prefix like "D:\D:\Program Files\...".
                 install_dir = install_dir.strip('"')
                 installer_args.append(f'/DIR={install_dir}')
-                logger.info(f"Preserving installation directory: {install_dir}")
+                logger.info("Preserving installation directory: %s", install_dir)
 
-            logger.info(f"Launching installer with args: {installer_args}")
+            logger.info("Launching installer with args: %s", installer_args)
             subprocess.Popen(installer_args)
 
             logger.info("Installer launched, exiting application")
             sys.exit(0)
 
         except Exception as e:
-            logger.error(f"Failed to run installer: {e}")
+            logger.error("Failed to run installer: %s", e)
             QMessageBox.critical(
                 self.parent_widget,
                 "Update Failed",
@@ -400,19 +974,26 @@ start "" "{current_exe_path}"
         Returns:
             True if update was applied (app will exit), False otherwise
         """
-        # Check for updates
-        has_update, release_info = self.check_for_updates()
+        from PyQt6.QtWidgets import QMessageBox
+
+        # Check for updates (explicit request → always ask GitHub)
+        has_update, release_info = self._run_off_gui_thread(self.check_for_updates, False)
 
         if not has_update:
             return False
 
+        # Start fetching the installer while the prompt is on screen
+        download_url = self.get_download_url(release_info)
+        expected_sha256 = self.get_expected_sha256(release_info, download_url) if download_url else None
+        if download_url:
+            self._start_prefetch(download_url, expected_sha256)
+
         # Prompt user
         if not self.prompt_update(release_info):
             logger.info("User declined update")
+            self._cancel_prefetch()
             return False
 
-        # Get download URL
-        download_url = self.get_download_url(release_info)
         if not download_url:
             QMessageBox.warning(
                 self.parent_widget,
@@ -421,8 +1002,8 @@ start "" "{current_exe_path}"
             )
             return False
 
-        # Download installer
-        installer_path = self.download_update(download_url)
+        # Download installer (verified when GitHub publishes a digest for it)
+        installer_path = self.download_update(download_url, expected_sha256)
         if not installer_path:
             return False
 
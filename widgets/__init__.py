@@ -1,6 +1,9 @@
 """LoL Viewer widget components."""
 from widgets.status_widget import LCUConnectionStatusWidget
-from widgets.webview_utils import NullWebView, QrCodeOverlay, _install_qr_overlay, _webengine_disabled
+from widgets.webview_utils import (
+    NullWebView, QrCodeOverlay, _install_qr_overlay, _webengine_disabled,
+    create_web_view, preload_webengine,
+)
 from widgets.viewer_list_item import ViewerListItemWidget, PendingPickListItemWidget
 from widgets.viewer_widget import ChampionViewerWidget
 from widgets.matchup_widgets import DraggableMatchupLabel, MatchupRowWidget
@@ -11,6 +14,8 @@ __all__ = [
     "QrCodeOverlay",
     "_install_qr_overlay",
     "_webengine_disabled",
+    "create_web_view",
+    "preload_webengine",
     "ViewerListItemWidget",
     "PendingPickListItemWidget",
     "ChampionViewerWidget",
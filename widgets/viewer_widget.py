@@ -18,7 +18,7 @@ from constants import (
     ARAM_QUEUE_IDS, ARAM_MAYHEM_QUEUE_IDS,
     get_ui_sizes,
 )
-from widgets.webview_utils import NullWebView, QrCodeOverlay, _install_qr_overlay, _webengine_disabled
+from widgets.webview_utils import QrCodeOverlay, _install_qr_overlay, create_web_view
 from champion_data import ChampionData, ChampionImageCache, setup_champion_input, setup_opponent_champion_input
 from logger import log
 
@@ -26,8 +26,6 @@ logger = logging.getLogger(__name__)
 
 from typing import List, Optional
 
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-
 
 class ChampionViewerWidget(QWidget):
     """Widget containing champion input, build/counter buttons, and web view"""
@@ -273,7 +271,7 @@ class ChampionViewerWidget(QWidget):
         self.viewer_content_stack = QStackedWidget()
 
         # Page 0: WebView
-        self.web_view = NullWebView() if _webengine_disabled() else QWebEngineView()
+        self.web_view = create_web_view()
         self.web_view.page().setBackgroundColor(QColor("#0d1117"))
         self.viewer_content_stack.addWidget(self.web_view)
 
@@ -6,8 +6,6 @@ from PyQt6.QtCore import Qt, QByteArray, QUrl
 from PyQt6.QtGui import QColor, QPixmap
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
 
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-
 
 def _webengine_disabled() -> bool:
     """Whether QWebEngine should be disabled (e.g., headless test runs)."""
@@ -22,6 +20,25 @@ def _webengine_disabled() -> bool:
     return False
 
 
+def preload_webengine() -> None:
+    """Import QtWebEngineWidgets up front unless the web engine is disabled.
+
+    Qt requires the module to be loaded before the QApplication is created,
+    so the entry point calls this first; everything else imports it lazily
+    via create_web_view() and headless runs never load Chromium at all.
+    """
+    if not _webengine_disabled():
+        import PyQt6.QtWebEngineWidgets  # noqa: F401
+
+
+def create_web_view() -> QWidget:
+    """Return a QWebEngineView, or a NullWebView when the web engine is disabled."""
+    if _webengine_disabled():
+        return NullWebView()
+    from PyQt6.QtWebEngineWidgets import QWebEngineView
+    return QWebEngineView()
+
+
 class NullWebView(QWidget):
     """Fallback widget when QWebEngineView cannot be used (headless/CI).
 